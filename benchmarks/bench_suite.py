@@ -0,0 +1,69 @@
+"""
+运行完整的基准测试，结果按当前 git 提交保存，便于比较不同提交之间的性能
+
+Usage: python benchmarks/bench_suite.py [--repeat N] [--scale N] [--compare OLD.json]
+
+与 tjhlp-checker bench 相同，但不依赖 typer
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from tjhlp_checker import bench
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = bench.generate_corpus(tmp, args.scale)
+        results = bench.run_benchmark(
+            corpus, args.repeat, lambda step: print(step, file=sys.stderr)
+        )
+    results["meta"]["commit"] = commit = current_commit()
+    print(bench.format_results(results))
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    bench.save_results(results, path := RESULTS_DIR / f"{commit}.json")
+    print(f"Saved to {path}")
+
+    failed = False
+    for overrun in bench.over_budget(results["import"]):
+        print("Over budget:", overrun)
+        failed = True
+    if args.compare:
+        regressions = bench.compare(
+            json.loads(args.compare.read_text()), results, args.threshold
+        )
+        for regression in regressions:
+            print("Regression:", regression)
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+比较旧的递归 traverse 与 visitor.walk 的遍历速度（节点/秒）
+
+完整的基准测试（解析与各规则的遍历）见 tjhlp-checker bench
+
+Usage: python benchmarks/bench_walk.py [--repeat N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import clang.cindex as CX
+
+from tjhlp_checker import Checker
+from tjhlp_checker.bench import deep_expression, stl_heavy
+from tjhlp_checker.config import Config
+from tjhlp_checker.visitor import walk
+
+STL_HEAVY = stl_heavy()
+DEEP = deep_expression()
+
+
+def legacy_walk(tu: CX.TranslationUnit) -> int:
+    """原先的遍历方式：递归 get_children，并逐个检查子节点是否在系统头文件中"""
+    visited = 0
+
+    def traverse(node: CX.Cursor):
+        nonlocal visited
+        visited += 1
+        _ = node.kind
+        for child in [
+            child
+            for child in node.get_children()
+            if not child.location.is_in_system_header
+        ]:
+            traverse(child)
+
+    traverse(tu.cursor)
+    # 不计入根节点，与 walk 的计数口径一致
+    return visited - 1
+
+
+def new_walk(tu: CX.TranslationUnit) -> int:
+    return walk(tu, lambda node, kind, context: None)
+
+
+def measure(name: str, tu: CX.TranslationUnit, repeat: int) -> None:
+    for label, fn in (("legacy", legacy_walk), ("walk", new_walk)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            nodes = fn(tu)
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{name:>10} {label:>8}: {nodes:>8} nodes, "
+            f"{best * 1000:8.1f} ms, {nodes / best:>10.0f} nodes/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # 旧实现每层表达式占用两层 Python 递归，需要放宽递归深度限制才能跑完 DEEP
+    sys.setrecursionlimit(10000)
+    checker = Checker(Config())
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, source in (("stl_heavy", STL_HEAVY), ("deep", DEEP)):
+            (file := Path(tmp) / f"{name}.cpp").write_text(source)
+            measure(name, checker.parse(file), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
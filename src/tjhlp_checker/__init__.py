@@ -1,6 +1,89 @@
-# 需要保证给 libclang 打 patch 的操作优先被执行
-from . import libclang_patch  # noqa: F401
-from .config import load_config
-from .checker import RuleViolation, ViolationKind, find_all_violations
+"""
+各名字在第一次被访问时才导入所在的模块：只用到 load_config 或 ViolationKind 时
+不会加载 libclang 与其余模块。给 libclang 打 patch 的 libclang_patch 由使用 libclang 的模块
+（checker、visitor、pch 等）最先导入，保证在 libclang 首次加载前执行
+"""
 
-__all__ = ["load_config", "RuleViolation", "ViolationKind", "find_all_violations"]
+import importlib
+from typing import TYPE_CHECKING
+
+# 名字到所在模块
+_EXPORTS = {
+    "AsyncChecker": "async_checker",
+    "Checker": "checker",
+    "CheckStats": "stats",
+    "IsolatedChecker": "isolated",
+    "MultiChecker": "checker",
+    "PrecompiledHeaders": "pch",
+    "Project": "project",
+    "ResultCache": "cache",
+    "check_async": "async_checker",
+    "check_isolated": "isolated",
+    "check_parallel": "parallel",
+    "check_project": "project",
+    "load_config": "config",
+    "RuleViolation": "checker",
+    "ViolationKind": "kinds",
+    "find_all_violations": "checker",
+    "find_all_violations_in_source": "checker",
+    "find_all_violations_multi": "checker",
+    "find_violated_kinds": "checker",
+    "has_violations": "checker",
+}
+
+__all__ = [
+    "AsyncChecker",
+    "Checker",
+    "CheckStats",
+    "IsolatedChecker",
+    "MultiChecker",
+    "PrecompiledHeaders",
+    "Project",
+    "ResultCache",
+    "check_async",
+    "check_isolated",
+    "check_parallel",
+    "check_project",
+    "load_config",
+    "RuleViolation",
+    "ViolationKind",
+    "find_all_violations",
+    "find_all_violations_in_source",
+    "find_all_violations_multi",
+    "find_violated_kinds",
+    "has_violations",
+]
+
+
+def __getattr__(name: str):
+    if (module := _EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .async_checker import AsyncChecker, check_async
+    from .cache import ResultCache
+    from .checker import (
+        Checker,
+        MultiChecker,
+        RuleViolation,
+        find_all_violations,
+        find_all_violations_in_source,
+        find_all_violations_multi,
+        find_violated_kinds,
+        has_violations,
+    )
+    from .config import load_config
+    from .isolated import IsolatedChecker, check_isolated
+    from .kinds import ViolationKind
+    from .parallel import check_parallel
+    from .pch import PrecompiledHeaders
+    from .project import Project, check_project
+    from .stats import CheckStats
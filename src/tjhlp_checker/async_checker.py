@@ -0,0 +1,125 @@
+"""
+asyncio 接口：在可被终止的工作进程中解析与检查，不阻塞事件循环
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Self
+
+from .cache import ResultCache
+from .checker import RuleViolation
+from .config import Config
+from .isolated import IsolatedChecker
+from .kinds import ViolationKind
+from .pch import PrecompiledHeaders
+
+
+def _check_with_timeout(
+    checker: IsolatedChecker, file: Path, timeout: float | None
+) -> list[RuleViolation]:
+    # 在线程中运行，此时该 IsolatedChecker 由这一次检查独占
+    checker.timeout = timeout
+    return checker.check(file)
+
+
+async def _interrupt(checker: IsolatedChecker, future: asyncio.Future) -> None:
+    # 被取消时工作进程可能还在启动，持续终止直到线程返回
+    while not future.done():
+        checker.kill()
+        await asyncio.sleep(0.05)
+
+
+class AsyncChecker:
+    """
+    异步检查器：由同一份配置构造，最多同时检查 concurrency 个文件（默认为 CPU 核数），
+    每个文件在一个 IsolatedChecker 的工作进程中检查，工作进程在多次检查之间复用。
+    超时或被取消的检查会终止其工作进程，不会占用工作进程影响之后的检查。
+    """
+
+    concurrency: int
+    checkers: list[IsolatedChecker]
+
+    def __init__(
+        self,
+        config: Config,
+        concurrency: int | None = None,
+        cache: ResultCache | None = None,
+        pch: PrecompiledHeaders | None = None,
+    ) -> None:
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.checkers = [
+            IsolatedChecker(config, cache=cache, pch=pch)
+            for _ in range(self.concurrency)
+        ]
+        # 线程只负责等待工作进程
+        self._threads = ThreadPoolExecutor(max_workers=self.concurrency)
+        # 空闲的 IsolatedChecker，同时也限制了并发数
+        self._idle: asyncio.Queue[IsolatedChecker] = asyncio.Queue()
+        for checker in self.checkers:
+            self._idle.put_nowait(checker)
+        self._interrupts: set[asyncio.Task] = set()
+
+    async def check(
+        self, file: Path | str, timeout: float | None = None
+    ) -> list[RuleViolation]:
+        """
+        timeout 从文件开始被检查时计时，不包括排队等待与启动工作进程的时间，
+        超时抛出 TimeoutError；工作进程崩溃或检查时出错抛出 RuntimeError
+        """
+        checker = await self._idle.get()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._threads, _check_with_timeout, checker, Path(file), timeout
+        )
+        # 线程结束后才把 IsolatedChecker 放回，取消时不会被两次检查同时使用
+        future.add_done_callback(lambda _: self._idle.put_nowait(checker))
+        try:
+            violations = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 下一次检查时重新启动工作进程
+            task = asyncio.create_task(_interrupt(checker, future))
+            self._interrupts.add(task)
+            task.add_done_callback(self._interrupts.discard)
+            raise
+        if violations and violations[0].kind == ViolationKind.TIMEOUT:
+            raise TimeoutError(violations[0].extra_message)
+        if violations and violations[0].kind == ViolationKind.CHECK_FAILED:
+            raise RuntimeError(violations[0].extra_message)
+        return violations
+
+    async def check_all(
+        self, files: list[Path | str], timeout: float | None = None
+    ) -> list[list[RuleViolation]]:
+        """并发地检查所有文件，按输入顺序返回结果"""
+        return await asyncio.gather(*(self.check(file, timeout) for file in files))
+
+    def close(self) -> None:
+        """终止所有工作进程；仍在进行的检查得到 RuntimeError"""
+        for checker in self.checkers:
+            checker.kill()
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        # 正在使用的 IsolatedChecker 由其线程在返回前清理
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+
+async def check_async(
+    file: Path | str,
+    config: Config,
+    timeout: float | None = None,
+    cache: ResultCache | None = None,
+    pch: PrecompiledHeaders | None = None,
+) -> list[RuleViolation]:
+    """
+    只检查一个文件时的便捷接口，每次调用都会启动一个新的工作进程；
+    需要检查多个文件时应复用同一个 AsyncChecker
+    """
+    async with AsyncChecker(config, 1, cache, pch) as checker:
+        return await checker.check(file, timeout)
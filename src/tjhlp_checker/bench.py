@@ -0,0 +1,404 @@
+"""
+性能基准：生成合成的作业语料，分别计时解析与按规则遍历，结果保存为 JSON 以便跨提交比较
+
+语料分为四类：
+    small: 典型的学生作业，数量多、体积小
+    stl:   大量使用 STL 的文件，解析以系统头文件为主
+    deep:  深度嵌套的表达式
+    large: 上千个函数的大文件
+"""
+
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+import clang.cindex as CX
+
+from .cache import _checker_version
+from .checker import Checker
+from .config import Config, GrammarConfig, HeaderConfig
+from .libclang_patch import get_clang_version
+from .visitor import walk
+
+_SMALL_TEMPLATES = (
+    """\
+#include <iostream>
+using namespace std;
+
+int main() {{
+    int n, sum = 0;
+    cin >> n;
+    for (int i = 1; i <= n; i++) {{
+        if (i % {a} == 0 || i % {b} == 0)
+            sum += i;
+    }}
+    cout << sum << endl;
+    return 0;
+}}
+""",
+    """\
+#include <iostream>
+#include <iomanip>
+#include <cmath>
+using namespace std;
+
+double area(double a, double b, double c) {{
+    double p = (a + b + c) / 2;
+    return sqrt(p * (p - a) * (p - b) * (p - c));
+}}
+
+int main() {{
+    double a, b, c;
+    cin >> a >> b >> c;
+    if (a + b <= c || a + c <= b || b + c <= a) {{
+        cout << "error" << endl;
+        return {a};
+    }}
+    cout << setiosflags(ios::fixed) << setprecision({b}) << area(a, b, c) << endl;
+    return 0;
+}}
+""",
+    """\
+#include <iostream>
+#include <cstring>
+using namespace std;
+
+const int N = {a}{b};
+
+struct Student {{
+    char name[20];
+    int score;
+}};
+
+void sort(Student s[], int n) {{
+    for (int i = 0; i < n - 1; i++)
+        for (int j = 0; j < n - 1 - i; j++)
+            if (s[j].score < s[j + 1].score) {{
+                Student t = s[j];
+                s[j] = s[j + 1];
+                s[j + 1] = t;
+            }}
+}}
+
+int main() {{
+    Student s[N];
+    int n = 0;
+    while (n < N && cin >> s[n].name >> s[n].score)
+        n++;
+    sort(s, n);
+    for (int i = 0; i < n; i++)
+        cout << s[i].name << ' ' << s[i].score << endl;
+    return 0;
+}}
+""",
+    """\
+#include <iostream>
+using namespace std;
+
+static int calls = 0;
+
+int gcd(int a, int b) {{
+    calls++;
+    return b == 0 ? a : gcd(b, a % b);
+}}
+
+int main() {{
+    int x = {a}, y = {b};
+    int *p = &x, &r = y;
+    long long big = (long long)*p * r;
+    switch (gcd(x, y)) {{
+    case 1:
+        cout << "coprime" << endl;
+        break;
+    default:
+        cout << (big >> 1) << ' ' << (x & y) << endl;
+    }}
+    do {{
+        x--;
+        if (x < 0) goto done;
+    }} while (x > y);
+done:
+    return 0;
+}}
+""",
+)
+
+_STL_FUNCTION = """
+int f{i}(const std::vector<int>& v) {{
+    std::map<int, std::string> m;
+    int acc = 0;
+    for (int j = 0; j < (int)v.size(); ++j) {{
+        if (v[j] > {i} && !(j & 1)) acc += v[j] << 1;
+        else acc ^= static_cast<int>(m.size());
+    }}
+    return acc > 0 ? acc : -acc;
+}}
+"""
+
+_LARGE_FUNCTION = """
+int g{i}(int a[], int n) {{
+    int s = 0;
+    for (int k = 0; k < n; k++) {{
+        if (a[k] > {i}) s += a[k] * {i};
+        else s -= a[k];
+    }}
+    while (s > 1000) s /= 2;
+    return s;
+}}
+"""
+
+
+def small_program(seed: int) -> str:
+    rng = random.Random(seed)
+    template = _SMALL_TEMPLATES[seed % len(_SMALL_TEMPLATES)]
+    return template.format(a=rng.randint(2, 9), b=rng.randint(2, 9))
+
+
+def stl_heavy(functions: int = 300) -> str:
+    return (
+        "#include <iostream>\n#include <vector>\n#include <string>\n#include <map>\n"
+        + "".join(_STL_FUNCTION.format(i=i) for i in range(functions))
+        + "int main() { std::cout << f0({1, 2, 3}) << std::endl; }\n"
+    )
+
+
+def deep_expression(terms: int = 1500) -> str:
+    return "int main() { int x = " + " + ".join(["1"] * terms) + "; return x; }\n"
+
+
+def large_file(functions: int = 2000) -> str:
+    return (
+        "".join(_LARGE_FUNCTION.format(i=i) for i in range(functions))
+        + "int main() { int a[3] = {1, 2, 3}; return g0(a, 3); }\n"
+    )
+
+
+def generate_corpus(directory: Path | str, scale: int = 1) -> dict[str, list[Path]]:
+    """在 directory 下生成语料，scale 按比例放大每一类的文件数"""
+    directory = Path(directory)
+    sources: dict[str, list[str]] = {
+        "small": [small_program(seed) for seed in range(20 * scale)],
+        "stl": [stl_heavy() for _ in range(scale)],
+        "deep": [deep_expression() for _ in range(2 * scale)],
+        "large": [large_file() for _ in range(scale)],
+    }
+    corpus: dict[str, list[Path]] = {}
+    for category, texts in sources.items():
+        (subdir := directory / category).mkdir(parents=True, exist_ok=True)
+        corpus[category] = []
+        for i, text in enumerate(texts):
+            (file := subdir / f"{i}.cpp").write_text(text)
+            corpus[category].append(file)
+    return corpus
+
+
+def rule_sets() -> dict[str, Config]:
+    """GrammarConfig 中的每条规则单独开启，以及头文件规则与全部开启"""
+    sets = {}
+    flags = [
+        name
+        for name, field in GrammarConfig.model_fields.items()
+        if field.annotation is bool
+    ]
+    for name in flags:
+        sets[name.removeprefix("disable_")] = Config(
+            grammar=GrammarConfig(**{name: True})
+        )
+    sets["system_class"] = Config(
+        grammar=GrammarConfig(
+            system_class=GrammarConfig.SystemClassConfig(
+                disable=True, whitelist=["std::string"]
+            )
+        )
+    )
+    sets["header"] = Config(header=HeaderConfig(blacklist=["map", "vector"]))
+    sets["all"] = Config(
+        header=HeaderConfig(blacklist=["map", "vector"]),
+        grammar=GrammarConfig(
+            **{name: True for name in flags},
+            system_class=GrammarConfig.SystemClassConfig(
+                disable=True, whitelist=["std::string"]
+            ),
+        ),
+    )
+    return sets
+
+
+# 各模块的导入时间预算（秒，python -X importtime 统计的累计时间）。
+# 只用到 ViolationKind 或 load_config 的工具不应加载 libclang，
+# 命令行工具不应在解析参数之前加载 libclang
+IMPORT_BUDGETS = {
+    "tjhlp_checker": 0.03,
+    "tjhlp_checker.kinds": 0.03,
+    "tjhlp_checker.config": 0.4,
+    "tjhlp_checker.cli": 0.5,
+    "tjhlp_checker.checker": 0.6,
+}
+
+
+def import_time(module: str) -> float:
+    """在新的解释器中导入 module 的累计时间"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    # 每行为 "import time: self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == module:
+            return int(cumulative) / 1e6
+    raise ValueError(f"no import time reported for {module}")
+
+
+def import_times(repeat: int = 3) -> dict[str, float]:
+    return {
+        module: min(import_time(module) for _ in range(repeat))
+        for module in IMPORT_BUDGETS
+    }
+
+
+def over_budget(times: dict[str, float]) -> list[str]:
+    return [
+        f"import {module}: {seconds * 1000:.1f}ms > {IMPORT_BUDGETS[module] * 1000:.0f}ms"
+        for module, seconds in times.items()
+        if seconds > IMPORT_BUDGETS.get(module, float("inf"))
+    ]
+
+
+def _best(repeat: int, fn: Callable[..., object], *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _noop(node: CX.Cursor, kind: CX.CursorKind, context: CX.Cursor) -> None:
+    return None
+
+
+def _parse(checker: Checker, files: list[Path]) -> list[CX.TranslationUnit]:
+    return [checker.parse(file) for file in files]
+
+
+def _traverse(checker: Checker | None, units: list[CX.TranslationUnit]) -> int:
+    """checker 为 None 时只遍历不检查，返回访问的节点数"""
+    if checker is None:
+        return sum(walk(tu, _noop) for tu in units)
+    for tu in units:
+        checker.check_translation_unit(tu)
+    return 0
+
+
+def run_benchmark(
+    corpus: dict[str, list[Path]],
+    repeat: int = 3,
+    progress: Callable[[str], None] | None = None,
+) -> dict:
+    """
+    返回各类语料的解析时间，以及每组规则在各类语料上的遍历检查时间（秒，取 repeat 次中的最小值）。
+    "walk" 为不做任何检查的纯遍历，作为遍历开销的基准
+    """
+    checker = Checker(Config())
+    results: dict = {
+        "meta": {
+            "checker_version": _checker_version(),
+            "clang_version": get_clang_version(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "files": {category: len(files) for category, files in corpus.items()},
+        "nodes": {},
+        "parse": {},
+        "traverse": {},
+        "import": {},
+    }
+    if progress:
+        progress("import")
+    results["import"] = import_times(repeat)
+
+    units: dict[str, list[CX.TranslationUnit]] = {}
+    for category, files in corpus.items():
+        if progress:
+            progress(f"parse {category}")
+        results["parse"][category] = _best(repeat, _parse, checker, files)
+        units[category] = _parse(checker, files)
+        results["nodes"][category] = _traverse(None, units[category])
+
+    rule_checkers = {"walk": None} | {
+        name: Checker(config) for name, config in rule_sets().items()
+    }
+    for name, rule_checker in rule_checkers.items():
+        if progress:
+            progress(f"traverse {name}")
+        results["traverse"][name] = {}
+        for category, tus in units.items():
+            results["traverse"][name][category] = _best(
+                repeat, _traverse, rule_checker, tus
+            )
+    return results
+
+
+def compare(old: dict, new: dict, threshold: float = 0.2) -> list[str]:
+    """列出比 old 慢超过 threshold（比例）的项目"""
+    regressions = []
+    for module, seconds in new.get("import", {}).items():
+        if (before := old.get("import", {}).get(module)) and seconds > before * (
+            1 + threshold
+        ):
+            regressions.append(
+                f"import/{module}: {before * 1000:.1f}ms -> {seconds * 1000:.1f}ms"
+            )
+    for category, seconds in new["parse"].items():
+        if (before := old["parse"].get(category)) and seconds > before * (
+            1 + threshold
+        ):
+            regressions.append(f"parse/{category}: {before:.3f}s -> {seconds:.3f}s")
+    for name, timings in new["traverse"].items():
+        for category, seconds in timings.items():
+            before = old["traverse"].get(name, {}).get(category)
+            if before and seconds > before * (1 + threshold):
+                regressions.append(
+                    f"traverse/{name}/{category}: {before:.3f}s -> {seconds:.3f}s"
+                )
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """以表格形式展示结果（毫秒）"""
+    categories = list(results["parse"])
+    width = max(map(len, results["traverse"]), default=8) + 2
+    lines = [
+        " " * width + "".join(f"{category:>12}" for category in categories),
+        f"{'files':<{width}}"
+        + "".join(f"{results['files'][category]:>12}" for category in categories),
+        f"{'nodes':<{width}}"
+        + "".join(f"{results['nodes'][category]:>12}" for category in categories),
+        f"{'parse':<{width}}"
+        + "".join(
+            f"{results['parse'][category] * 1000:>12.1f}" for category in categories
+        ),
+    ]
+    for name, timings in results["traverse"].items():
+        lines.append(
+            f"{name:<{width}}"
+            + "".join(f"{timings[category] * 1000:>12.1f}" for category in categories)
+        )
+    for module, seconds in results.get("import", {}).items():
+        lines.append(f"import {module:<{width + 5}}{seconds * 1000:>12.1f}")
+    return "\n".join(lines)
+
+
+def save_results(results: dict, path: Path | str) -> None:
+    Path(path).write_text(json.dumps(results, indent=2) + "\n")
@@ -0,0 +1,113 @@
+"""
+基于内容哈希的检查结果磁盘缓存
+
+缓存键由源文件路径与内容、配置、检查器及 libclang 版本决定；
+缓存项中另外记录了翻译单元包含的所有头文件的内容哈希，读取时逐一校验，
+任何一个头文件发生变化都视为未命中。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from .checker import RuleViolation
+from .config import Config
+from .libclang_patch import get_clang_version
+
+# 缓存项格式变化时递增，使旧缓存失效
+CACHE_FORMAT_VERSION = 4
+
+
+def _checker_version() -> str:
+    try:
+        return version("tjhlp-checker")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ResultCache:
+    directory: Path
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 同一个头文件在批量检查中会被反复校验，按 (路径, 修改时间, 大小) 记住其哈希
+        self._digests: dict[tuple[str, int, int], str] = {}
+
+    def __getstate__(self) -> dict:
+        # 跨进程传递时不携带已计算的哈希
+        return {"directory": self.directory}
+
+    def __setstate__(self, state: dict) -> None:
+        self.directory = state["directory"]
+        self._digests = {}
+
+    def key(
+        self, file: Path, source: bytes, config: Config, snippets: bool = False
+    ) -> str:
+        """snippets: 结果中是否填写了 snippet"""
+        digest = hashlib.sha256()
+        for part in (
+            str(CACHE_FORMAT_VERSION),
+            _checker_version(),
+            get_clang_version(),
+            config.model_dump_json(),
+            str(snippets),
+            str(file.resolve()),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _file_digest(self, filename: str) -> str | None:
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        stamp = (filename, stat.st_mtime_ns, stat.st_size)
+        if stamp not in self._digests:
+            with open(filename, "rb") as f:
+                self._digests[stamp] = hashlib.file_digest(f, "sha256").hexdigest()
+        return self._digests[stamp]
+
+    def get(self, key: str) -> list[RuleViolation] | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if any(
+            self._file_digest(filename) != digest
+            for filename, digest in entry["includes"].items()
+        ):
+            return None
+        return [RuleViolation.from_dict(data) for data in entry["violations"]]
+
+    def put(
+        self, key: str, includes: list[str], violations: list[RuleViolation]
+    ) -> None:
+        entry = {
+            "includes": {
+                filename: digest
+                for filename in includes
+                if (digest := self._file_digest(filename)) is not None
+            },
+            "violations": [violation.to_dict() for violation in violations],
+        }
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # 先写入临时文件再替换，避免并行的工作进程读到写了一半的缓存项
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, suffix=".tmp", delete=False
+        ) as f:
+            json.dump(entry, f)
+        os.replace(f.name, path)
@@ -3,88 +3,1152 @@
 由于 libclang 18.1.1 库的类型标注不够完善, 会出现无法识别枚举类型成员的错误，可以忽略或者手动修正
 """
 
-from enum import Enum
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
 import os
+import re
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import clang.cindex as CX
 from clang.cindex import CursorKind as CK
+from clang.cindex import callbacks, conf  # type: ignore
 
 from .config import Config
+from .kinds import ViolationKind
 from .libclang_patch import BinaryOperator as BO
 from .libclang_patch import UnaryOperator as UO
+from .libclang_patch import count_calls, get_file_contents, get_file_offset
+from .stats import CheckStats
+from .visitor import ChildVisit, walk
 
+if TYPE_CHECKING:
+    from .cache import ResultCache
+    from .pch import PrecompiledHeaders
 
-class ViolationKind(Enum):
-    HEADER = 0
-    INT64 = 1
-    POINTER = 2
-    REFERENCE = 3
-    ARRAY = 4
-    STRUCT = 5
-    CLASS = 6
-    FUNCTION = 7
-    AUTO = 8
-    BRANCH = 9
-    GOTO = 10
-    LOOP = 11
-    BIT_OPERATION = 12
-    SYSTEM_CLASS = 13
-    INTERNAL_GLOBAL = 14
-    EXTERNAL_GLOBAL = 15
-    STATIC_LOCAL = 16
 
+# CXTranslationUnit_CreatePreambleOnFirstParse，clang.cindex 中没有对应的常量
+PARSE_CREATE_PREAMBLE_ON_FIRST_PARSE = 0x100
 
+
+@dataclass(slots=True)
 class RuleViolation:
+    """
+    一条违规记录。位置信息在遍历时即已取出，默认不引用任何 clang 对象，
+    因此可以被 pickle，也不会让翻译单元常驻内存
+    """
+
     kind: ViolationKind
-    cursor: CX.Cursor
-    context: CX.Cursor
-    extra_message: str
+    file: str
+    line: int
+    column: int
+    start_offset: int
+    end_offset: int
+    # 违规所在的函数/结构体/类的名字，全局作用域为空串
+    context: str
+    extra_message: str = ""
+    # 违规处的源码，取自翻译单元已加载的文件内容。仅当 Checker 以 snippets=True 构造时
+    # 填写，否则与无法按配置的编码解码时一样为 None
+    snippet: str | None = None
+    # 启用 [report] aggregate 时，合并到这一条中的违规数
+    count: int = 1
+    # 仅当 Checker 以 keep_cursors=True 构造时保留，会使翻译单元一直存活
+    cursor: CX.Cursor | None = field(default=None, repr=False, compare=False)
+    context_cursor: CX.Cursor | None = field(default=None, repr=False, compare=False)
 
-    def __init__(
-        self,
+    @classmethod
+    def from_cursor(
+        cls,
         kind: ViolationKind,
         cursor: CX.Cursor,
         context: CX.Cursor,
         extra_message: str = "",
-    ) -> None:
-        self.kind = kind
-        self.cursor = cursor
-        self.context = context
-        self.extra_message = extra_message
+        keep_cursors: bool = False,
+    ) -> "RuleViolation":
+        location = cursor.location
+        extent = cursor.extent
+        return cls(
+            kind,
+            location.file.name if location.file else "",
+            location.line,
+            location.column,
+            extent.start.offset,
+            extent.end.offset,
+            "" if context.kind == CK.TRANSLATION_UNIT else context.spelling,
+            extra_message,
+            None,
+            1,
+            cursor if keep_cursors else None,
+            context if keep_cursors else None,
+        )
+
+    def to_dict(self) -> dict:
+        """转换为可以 JSON 序列化的字典（不含 cursor）"""
+        return {
+            "kind": self.kind.name,
+            "file": self.file,
+            "line": self.line,
+            "column": self.column,
+            "start_offset": self.start_offset,
+            "end_offset": self.end_offset,
+            "context": self.context,
+            "extra_message": self.extra_message,
+            "snippet": self.snippet,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RuleViolation":
+        return cls(**(data | {"kind": ViolationKind[data["kind"]]}))
+
+    def __reduce__(self):
+        # CX.Cursor 无法被 pickle，序列化时丢弃
+        return RuleViolation, (
+            self.kind,
+            self.file,
+            self.line,
+            self.column,
+            self.start_offset,
+            self.end_offset,
+            self.context,
+            self.extra_message,
+            self.snippet,
+            self.count,
+        )
 
     def __str__(self) -> str:
-        location = self.cursor.location
-        return f"{str(self.kind).removeprefix('ViolationKind.')} ({location.line}, {location.column})"
+        return f"{str(self.kind).removeprefix('ViolationKind.')} ({self.line}, {self.column})"
 
     def __repr__(self) -> str:
         return str(self)
 
 
-def find_all_violations(file: Path, config: Config):
-    parse_options = CX.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
-    if file.name.endswith((".h", ".hpp")):
-        parse_options |= CX.TranslationUnit.PARSE_INCOMPLETE
+# 发现违规时的回调
+OnViolation = Callable[[RuleViolation], None]
+
+
+class Checker:
+    """
+    批量检查器：由同一份配置构造，在多个文件之间复用同一个 clang Index
+    """
+
+    config: Config
+    rules: "_RuleSet"
+    index: CX.Index
+    keep_cursors: bool
+    cache: "ResultCache | None"
+    pch: "PrecompiledHeaders | None"
+    snippets: bool
+
+    def __init__(
+        self,
+        config: Config,
+        keep_cursors: bool = False,
+        cache: "ResultCache | None" = None,
+        pch: "PrecompiledHeaders | None" = None,
+        snippets: bool = False,
+    ) -> None:
+        """
+        keep_cursors: 是否在违规记录中保留 cursor/context_cursor
+        cache: 检查结果缓存，保留 cursor 时不使用
+        pch: 常用系统头文件的预编译头缓存
+        snippets: 是否在违规记录中填写 snippet，供需要显示源码的输出使用
+        """
+        self.config = config
+        self.rules = _RuleSet(config)
+        # 使用 PCH 时排除 PCH 中的声明与预处理实体（例如 PCH 自身的包含指令），
+        # 只遍历文件本身的内容
+        self.index = CX.Index.create(excludeDecls=pch is not None)
+        self.keep_cursors = keep_cursors
+        self.cache = cache
+        self.pch = pch
+        self.snippets = snippets
+
+    def parse(
+        self,
+        file: Path,
+        reparsable: bool = False,
+        skip_function_bodies: bool | None = None,
+        unsaved_files: Sequence[tuple[Path, bytes]] | None = None,
+        extra_args: Sequence[str] = (),
+        stats: CheckStats | None = None,
+    ) -> CX.TranslationUnit:
+        """
+        reparsable: 为之后的 tu.reparse() 在首次解析时就构建好 preamble，
+        使重新解析时不必再处理文件开头包含的头文件
+        skip_function_bodies: 默认在启用的规则都与函数体无关时跳过函数体
+        unsaved_files: (路径, 内容)，代替文件系统中的文件（可以不存在），见 check_source
+        extra_args: 额外的编译参数，例如 compile_commands.json 中的 -I、-D
+        stats: 解析耗时计入 stats.parse_time
+        """
+        start = time.perf_counter()
+        parse_options = CX.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+        if file.name.endswith((".h", ".hpp")):
+            parse_options |= CX.TranslationUnit.PARSE_INCOMPLETE
+        if skip_function_bodies is None:
+            skip_function_bodies = self.rules.skip_function_bodies
+        if skip_function_bodies:
+            # 预处理的结果不受影响，包含指令与宏仍然完整
+            parse_options |= CX.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES
+        if reparsable:
+            parse_options |= (
+                CX.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE
+                | PARSE_CREATE_PREAMBLE_ON_FIRST_PARSE
+            )
+
+        args = (
+            [f"-finput-charset={self.config.common.encoding}"]
+            + (["-m32"] if self.config.common.is_32bit else [])
+            + list(extra_args)
+        )
+        unsaved_files = list(unsaved_files or ())
+        path = file.resolve()
+        pch_args = []
+        if self.pch:
+            # 内存中的源文件可能为空，不能用 or 判断是否存在
+            content = next(
+                (content for name, content in unsaved_files if name == path), None
+            )
+            if content is None:
+                content = file.read_bytes()
+            pch_args = self.pch.arguments(
+                self.index, file, content, self.config.common, args
+            )
+
+        path = path.__bytes__() if os.name == "posix" else str(path)
+        tu = self.index.parse(
+            path,
+            options=parse_options,
+            args=args + pch_args,
+            unsaved_files=unsaved_files,
+        )
+        if pch_args and (
+            errors := [
+                diagnostic
+                for diagnostic in tu.diagnostics
+                if diagnostic.severity >= CX.Diagnostic.Error
+            ]
+        ):
+            if any(
+                diagnostic.severity >= CX.Diagnostic.Fatal
+                and "precompiled header" in diagnostic.spelling
+                for diagnostic in errors
+            ):
+                # PCH 无法加载（例如已过期或损坏），删除
+                assert self.pch
+                self.pch.invalidate(pch_args)
+            # 有错误时无法确定是否由 PCH 引起，以不使用 PCH 的解析结果为准
+            pch_args = []
+            tu = self.index.parse(
+                path, options=parse_options, args=args, unsaved_files=unsaved_files
+            )
+        # 供 _RuleSet.check 判断是否需要检查被跳过的函数体，reparse 后仍然有效
+        tu._function_bodies_skipped = skip_function_bodies
+        # clang_getInclusions 不报告由 PCH 提供的包含，_RuleSet.check 不能据此预判
+        tu._uses_pch = bool(pch_args)
+        # 需要完整地重新解析时使用
+        tu._parse_arguments = (
+            file,
+            {"unsaved_files": unsaved_files, "extra_args": extra_args},
+        )
+        if stats is not None:
+            stats.parse_time += time.perf_counter() - start
+        return tu
+
+    def check(
+        self,
+        file: Path | str,
+        stats: CheckStats | None = None,
+        on_violation: OnViolation | None = None,
+    ) -> list[RuleViolation]:
+        """
+        stats: 若传入，检查过程中的统计信息会累加到其中
+        on_violation: 若传入，每发现一条违规就立即以其调用，便于流式输出。
+        [report] aggregate 开启时在文件检查完成后才依次调用，count 为合并后的值
+        """
+        file = Path(file)
+        if stats is not None:
+            stats.files += 1
+            if stats.count_libclang_calls:
+                with count_calls(stats.libclang_calls):
+                    return self._check(file, stats, on_violation)
+        return self._check(file, stats, on_violation)
+
+    def check_source(
+        self,
+        source: bytes | str,
+        filename: str = "main.cpp",
+        headers: dict[str, bytes | str] | None = None,
+        stats: CheckStats | None = None,
+        on_violation: OnViolation | None = None,
+    ) -> list[RuleViolation]:
+        """
+        检查内存中的源码，不经过文件系统中的临时文件。
+        filename 与 headers 中的文件名都相对于 [header] 的 base_path，
+        因此 headers 中的虚拟头文件视为本地头文件，可以用 #include "name" 包含。
+        str 按配置的编码转换为字节。不使用结果缓存
+        """
+        base_path = self.config.header.base_path
+        encoding = self.config.common.encoding
+        file = base_path / filename
+        unsaved_files = [
+            (
+                (base_path / name).resolve(),
+                content.encode(encoding) if isinstance(content, str) else content,
+            )
+            for name, content in [(filename, source), *(headers or {}).items()]
+        ]
+
+        def check() -> list[RuleViolation]:
+            tu = self.parse(file, unsaved_files=unsaved_files, stats=stats)
+            return self.check_translation_unit(tu, stats, on_violation)
+
+        if stats is not None:
+            stats.files += 1
+            if stats.count_libclang_calls:
+                with count_calls(stats.libclang_calls):
+                    return check()
+        return check()
+
+    def _check(
+        self, file: Path, stats: CheckStats | None, on_violation: OnViolation | None
+    ) -> list[RuleViolation]:
+        if self.cache is None or self.keep_cursors:
+            return self.check_translation_unit(
+                self.parse(file, stats=stats), stats, on_violation
+            )
+
+        key = self.cache.key(file, file.read_bytes(), self.config, self.snippets)
+        if (violations := self.cache.get(key)) is not None:
+            if stats is not None:
+                stats.result_cache_hits += 1
+            if on_violation:
+                for violation in violations:
+                    on_violation(violation)
+            return violations
+        if stats is not None:
+            stats.result_cache_misses += 1
+
+        tu = self.parse(file, stats=stats)
+        violations = self.check_translation_unit(tu, stats, on_violation)
+        # 用户代码中缺失头文件等致命错误出现时，结果可能随之后补上的文件而变化，不缓存
+        if not any(
+            diagnostic.severity >= CX.Diagnostic.Fatal
+            and not diagnostic.location.is_in_system_header
+            for diagnostic in tu.diagnostics
+        ):
+            self.cache.put(
+                key,
+                list(
+                    dict.fromkeys(include.include.name for include in tu.get_includes())
+                ),
+                violations,
+            )
+        return violations
+
+    def check_translation_unit(
+        self,
+        tu: CX.TranslationUnit,
+        stats: CheckStats | None = None,
+        on_violation: OnViolation | None = None,
+    ) -> list[RuleViolation]:
+        """检查一个已经解析好的翻译单元，例如 reparse 之后的"""
+        try:
+            return self.rules.check(
+                tu, self.keep_cursors, stats, on_violation, self.snippets
+            )
+        except _FunctionBodiesNeeded:
+            # 被跳过的函数体中可能有违规，完整地重新解析
+            if stats is not None:
+                stats.function_body_fallbacks += 1
+            file, options = tu._parse_arguments
+            tu = self.parse(file, skip_function_bodies=False, stats=stats, **options)
+            return self.rules.check(
+                tu, self.keep_cursors, stats, on_violation, self.snippets
+            )
+
+    def check_all(
+        self, files: Iterable[Path | str]
+    ) -> Iterator[tuple[Path, list[RuleViolation]]]:
+        """逐个检查文件，每检查完一个文件就产出它的结果"""
+        for file in files:
+            file = Path(file)
+            yield file, self.check(file)
+
+
+class MultiChecker:
+    """
+    用多份配置检查同一批文件，例如同一次作业的多个题目变体。
+    [common] 相同的配置共用一次解析与一次遍历，结果按配置的顺序分组返回
+    """
+
+    configs: list[Config]
+    keep_cursors: bool
+    # 每个 [common] 一个 Checker（用于解析）及使用它的配置的下标
+    groups: list[tuple[Checker, list[int]]]
+    rule_sets: list["_RuleSet"]
+
+    def __init__(
+        self,
+        configs: Iterable[Config],
+        keep_cursors: bool = False,
+        pch: "PrecompiledHeaders | None" = None,
+    ) -> None:
+        self.configs = list(configs)
+        self.keep_cursors = keep_cursors
+        self.rule_sets = [_RuleSet(config) for config in self.configs]
+        groups: dict[str, tuple[Checker, list[int]]] = {}
+        for i, config in enumerate(self.configs):
+            key = config.common.model_dump_json()
+            if key not in groups:
+                groups[key] = (Checker(config, keep_cursors, pch=pch), [])
+            groups[key][1].append(i)
+        self.groups = list(groups.values())
+
+    def check(
+        self, file: Path | str, stats: CheckStats | None = None
+    ) -> list[list[RuleViolation]]:
+        """返回的列表与 configs 一一对应"""
+        file = Path(file)
+        if stats is not None:
+            stats.files += 1
+        results: list[list[RuleViolation]] = [[] for _ in self.configs]
+        for checker, indices in self.groups:
+            if not (indices := [i for i in indices if self.rule_sets[i].handlers]):
+                continue
+            rule_sets = [self.rule_sets[i] for i in indices]
+            # 所有配置都只有声明层面的规则时才跳过函数体
+            tu = checker.parse(
+                file,
+                skip_function_bodies=all(
+                    rules.skip_function_bodies for rules in rule_sets
+                ),
+                stats=stats,
+            )
+            try:
+                found = _check_rule_sets(tu, rule_sets, self.keep_cursors, stats)
+            except _FunctionBodiesNeeded:
+                if stats is not None:
+                    stats.function_body_fallbacks += 1
+                tu = checker.parse(file, skip_function_bodies=False, stats=stats)
+                found = _check_rule_sets(tu, rule_sets, self.keep_cursors, stats)
+            for i, violations in zip(indices, found):
+                results[i] = violations
+        return results
+
+    def check_all(
+        self, files: Iterable[Path | str]
+    ) -> Iterator[tuple[Path, list[list[RuleViolation]]]]:
+        for file in files:
+            file = Path(file)
+            yield file, self.check(file)
+
+
+def find_all_violations(
+    file: Path | str,
+    config: Config,
+    keep_cursors: bool = False,
+    cache: "ResultCache | None" = None,
+    stats: CheckStats | None = None,
+    pch: "PrecompiledHeaders | None" = None,
+) -> list[RuleViolation]:
+    return Checker(config, keep_cursors, cache, pch).check(file, stats)
+
+
+def find_all_violations_in_source(
+    source: bytes | str,
+    config: Config,
+    filename: str = "main.cpp",
+    headers: dict[str, bytes | str] | None = None,
+    keep_cursors: bool = False,
+    stats: CheckStats | None = None,
+    pch: "PrecompiledHeaders | None" = None,
+) -> list[RuleViolation]:
+    """见 Checker.check_source"""
+    return Checker(config, keep_cursors, pch=pch).check_source(
+        source, filename, headers, stats
+    )
+
+
+def find_all_violations_multi(
+    file: Path | str,
+    configs: Iterable[Config],
+    keep_cursors: bool = False,
+    stats: CheckStats | None = None,
+    pch: "PrecompiledHeaders | None" = None,
+) -> list[list[RuleViolation]]:
+    """按 configs 的顺序返回每份配置下的违规，见 MultiChecker"""
+    return MultiChecker(configs, keep_cursors, pch).check(file, stats)
+
+
+def _with_report(config: Config, **options) -> Config:
+    return config.model_copy(
+        update={"report": config.report.model_copy(update=options)}
+    )
+
+
+def has_violations(
+    file: Path | str,
+    config: Config,
+    cache: "ResultCache | None" = None,
+    pch: "PrecompiledHeaders | None" = None,
+) -> bool:
+    """只判断是否存在违规，发现第一条违规后即结束遍历"""
+    config = _with_report(config, stop_at_first=True)
+    return bool(Checker(config, cache=cache, pch=pch).check(file))
+
+
+def find_violated_kinds(
+    file: Path | str,
+    config: Config,
+    cache: "ResultCache | None" = None,
+    pch: "PrecompiledHeaders | None" = None,
+) -> set[ViolationKind]:
+    """违规的类型，每类违规只记录第一条，所有启用的规则都出现违规后即结束遍历"""
+    config = _with_report(config, kinds_only=True)
+    return {vio.kind for vio in Checker(config, cache=cache, pch=pch).check(file)}
+
+
+# 处理函数：(遍历状态, 节点, 上下文)
+Handler = Callable[["_Traversal", CX.Cursor, CX.Cursor], None]
+
+BIT_BINARY_OPERATORS = (
+    BO.Shl,
+    BO.ShlAssign,
+    BO.Shr,
+    BO.ShrAssign,
+    BO.And,
+    BO.AndAssign,
+    BO.Or,
+    BO.OrAssign,
+    BO.Xor,
+    BO.XorAssign,
+)
+BRANCH_BINARY_OPERATORS = (
+    BO.LAnd,
+    BO.LE,
+    BO.EQ,
+    BO.NE,
+    BO.LOr,
+    BO.LT,
+    BO.GT,
+    BO.GE,
+)
+
+
+@lru_cache(maxsize=4096)
+def _resolve(filename: str) -> Path:
+    """
+    Path.resolve 需要逐级访问文件系统，在网络文件系统上尤其慢；
+    所有 Checker 共用这一缓存，长期运行时符号链接的变化不会被察觉
+    """
+    return Path(filename).resolve()
+
+
+def user_includes(tu: CX.TranslationUnit) -> list[str]:
+    """
+    用户代码（不在系统头文件中的包含指令）直接包含的所有文件。
+    tu.get_includes() 返回的位置指向回调结束后即被释放的内存，不能在回调之外使用，
+    因此这里在回调中直接判断
+    """
+    names = []
+
+    def visitor(file, stack, depth, _):
+        if depth > 0 and not stack.contents.is_in_system_header:
+            names.append(CX.File(file).name)
+
+    conf.lib.clang_getInclusions(
+        tu, callbacks["translation_unit_includes"](visitor), None
+    )
+    return names
+
+
+def _record_as(kind: ViolationKind) -> Handler:
+    """无需进一步判断、直接记录违规的处理函数"""
+
+    def handler(traversal: "_Traversal", node: CX.Cursor, context: CX.Cursor):
+        traversal.record(kind, node, context)
+
+    # 统计每条规则的耗时时以函数名区分
+    handler.__name__ = f"record_{kind.name.lower()}"
+    return handler
+
+
+class _FunctionBodiesNeeded(Exception):
+    """跳过函数体解析得到的结果可能不完整，需要完整地重新解析"""
+
+
+class _StopWalk(Exception):
+    """已经得到了所需的全部结果，提前结束遍历"""
+
+
+# 只有这些节点上注册了处理函数时，违规才不可能出现在被跳过的函数体中
+# （除了局部的结构体/类与块作用域的 extern 声明，见 _SkippedBodies）
+_DECLARATION_KINDS = frozenset(
+    {CK.INCLUSION_DIRECTIVE, CK.VAR_DECL, CK.FIELD_DECL, CK.STRUCT_DECL, CK.CLASS_DECL}
+)
+
+# 函数体可能被跳过的节点
+_FUNCTION_KINDS = frozenset(
+    {
+        CK.FUNCTION_DECL,
+        CK.CXX_METHOD,
+        CK.CONSTRUCTOR,
+        CK.DESTRUCTOR,
+        CK.CONVERSION_FUNCTION,
+        CK.FUNCTION_TEMPLATE,
+    }
+)
+
+_IDENTIFIER = re.compile(rb"[A-Za-z_]\w*")
 
-    index = CX.Index.create()
-    tu = index.parse(
-        file.resolve().__bytes__() if os.name == "posix" else str(file.resolve()),
-        options=parse_options,
-        args=[f"-finput-charset={config.common.encoding}"]
-        + (["-m32"] if config.common.is_32bit else []),
+
+class _SkippedBodies:
+    """
+    以 PARSE_SKIP_FUNCTION_BODIES 解析时，被跳过的函数体不出现在 AST 中，
+    函数节点的范围也只到函数体之前。遍历时记下每个函数的结束位置与其他节点的起始位置，
+    函数结束到同一文件中下一个节点开始之间的源码即包含了被跳过的函数体。
+    若其中出现了规则相关的关键字、展开后含有关键字的宏（只追踪用户代码中定义的宏的嵌套展开）
+    或包含指令，就需要完整解析。函数来自宏展开时，函数体可能整个在宏定义中，
+    因此与函数范围重叠的宏展开也要检查。无法取得定义的宏（例如命令行中 -D 定义的）
+    与含有 ## 拼接的宏都视为可能展开出关键字
+    """
+
+    keywords: re.Pattern[bytes]
+    files: dict[str, CX.File]
+    # 各文件中除预处理实体外所有节点的起始位置
+    starts: dict[str, list[int]]
+    # 各文件中函数节点的 (起始位置, 结束位置)
+    functions: dict[str, list[tuple[int, int]]]
+    # 各文件中的宏展开与包含指令：(起始位置, 结束位置, 宏展开的 cursor 或 None)
+    preprocessing: dict[str, list[tuple[int, int, CX.Cursor | None]]]
+    # 用户代码中定义的宏，宏名到定义的源码
+    macros: dict[bytes, bytes]
+    # 没有源码位置的宏（编译器内置的与命令行中定义的）
+    unknown_macros: set[bytes]
+
+    def __init__(self, tu: CX.TranslationUnit, keywords: re.Pattern[bytes]) -> None:
+        self.tu = tu
+        self.keywords = keywords
+        self.files = {}
+        self.starts = {}
+        self.functions = {}
+        self.preprocessing = {}
+        self.macros = {}
+        self.unknown_macros = set()
+        self.sources: dict[str, bytes] = {}
+
+    def source(self, file: CX.File) -> bytes:
+        if (source := self.sources.get(file.name)) is None:
+            source = self.sources[file.name] = get_file_contents(self.tu, file)
+        return source
+
+    def text(self, node: CX.Cursor) -> bytes:
+        extent = node.extent
+        if (file := extent.start.file) is None:
+            return b""
+        return self.source(file)[extent.start.offset : extent.end.offset]
+
+    def visit(self, node: CX.Cursor, kind: CX.CursorKind) -> None:
+        extent = node.extent
+        start = extent.start
+        if (file := start.file) is None:
+            if kind == CK.MACRO_DEFINITION:
+                self.unknown_macros.add(node.spelling.encode())
+            return
+        name = file.name
+        self.files[name] = file
+        if kind == CK.MACRO_DEFINITION:
+            self.macros[node.spelling.encode()] = self.text(node)
+        elif kind == CK.MACRO_INSTANTIATION:
+            self.preprocessing.setdefault(name, []).append(
+                (start.offset, extent.end.offset, node)
+            )
+        elif kind == CK.INCLUSION_DIRECTIVE:
+            self.preprocessing.setdefault(name, []).append(
+                (start.offset, extent.end.offset, None)
+            )
+        else:
+            self.starts.setdefault(name, []).append(start.offset)
+            if kind in _FUNCTION_KINDS:
+                self.functions.setdefault(name, []).append(
+                    (start.offset, extent.end.offset)
+                )
+
+    def expands_to_keyword(self, definition: bytes, seen: set[bytes]) -> bool:
+        if self.keywords.search(definition) or b"##" in definition:
+            return True
+        for identifier in _IDENTIFIER.findall(definition):
+            if identifier in self.unknown_macros:
+                return True
+            if identifier in self.macros and identifier not in seen:
+                seen.add(identifier)
+                if self.expands_to_keyword(self.macros[identifier], seen):
+                    return True
+        return False
+
+    def may_expand_to_keyword(self, node: CX.Cursor | None) -> bool:
+        """node 为宏展开的 cursor，None 表示包含指令"""
+        if node is None:
+            return True
+        name = node.spelling.encode()
+        definition = self.macros.get(name)
+        if definition is None and (referenced := node.referenced):
+            # 系统头文件中定义的宏
+            definition = self.text(referenced)
+        if not definition:
+            return True
+        return self.expands_to_keyword(definition, {name})
+
+    def may_hide_violations(self) -> bool:
+        for name, functions in self.functions.items():
+            source = self.source(self.files[name])
+            starts = sorted(self.starts[name])
+            preprocessing = sorted(
+                self.preprocessing.get(name, ()), key=lambda item: item[0]
+            )
+            offsets = [offset for offset, _, _ in preprocessing]
+            for start, end in functions:
+                index = bisect_left(starts, end)
+                next_start = starts[index] if index < len(starts) else len(source)
+                if self.keywords.search(source, end, next_start):
+                    return True
+                # 从包含函数起始位置的宏展开（同一文件中的宏展开互不重叠，
+                # 只可能是起始位置之前的最后一个）到下一个节点之前的所有宏展开
+                first = bisect_left(offsets, start)
+                if first and preprocessing[first - 1][1] > start:
+                    first -= 1
+                for i in range(first, bisect_left(offsets, next_start)):
+                    if self.may_expand_to_keyword(preprocessing[i][2]):
+                        return True
+        return False
+
+
+class _RuleSet:
+    """
+    由配置编译出的规则分派表。只为启用了规则的 CursorKind 注册处理函数，
+    其余节点只是被遍历经过；没有启用任何与类型相关的规则时不做类型查询
+    """
+
+    config: Config
+    handlers: dict[CX.CursorKind, tuple[Handler, ...]]
+    # 运算符（BinaryOperator/UnaryOperator 的值）到违规类型的映射
+    binary_operators: dict[int, ViolationKind]
+    unary_operators: dict[int, ViolationKind]
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        grammar = config.grammar
+
+        self.binary_operators = {}
+        self.unary_operators = {}
+        if grammar.disable_bit_operation:
+            for op in BIT_BINARY_OPERATORS:
+                self.binary_operators[op.value] = ViolationKind.BIT_OPERATION
+            self.unary_operators[UO.Not.value] = ViolationKind.BIT_OPERATION
+        if grammar.disable_branch:
+            for op in BRANCH_BINARY_OPERATORS:
+                self.binary_operators[op.value] = ViolationKind.BRANCH
+            self.unary_operators[UO.LNot.value] = ViolationKind.BRANCH
+
+        check_types = (
+            grammar.disable_int64_or_larger
+            or grammar.disable_pointer
+            or grammar.disable_reference
+            or grammar.disable_array
+            or grammar.disable_function
+            or grammar.system_class.disable
+        )
+        check_linkage = (
+            grammar.disable_internal_global_var
+            or grammar.disable_external_global_var
+            or grammar.disable_static_local_var
+        )
+
+        # 同一节点上的多个处理函数按注册顺序执行，与违规的报告顺序一致
+        handlers: dict[CX.CursorKind, list[Handler]] = {}
+
+        def register(kinds: tuple[CX.CursorKind, ...], handler: Handler):
+            for kind in kinds:
+                handlers.setdefault(kind, []).append(handler)
+
+        if config.header.whitelist or config.header.blacklist:
+            register((CK.INCLUSION_DIRECTIVE,), _Traversal.check_inclusion)
+        if check_types:
+            register((CK.VAR_DECL, CK.FIELD_DECL), _Traversal.check_node_type)
+        if check_linkage:
+            register((CK.VAR_DECL, CK.FIELD_DECL), _Traversal.check_var_linkage)
+        if grammar.disable_function:
+            register((CK.FUNCTION_DECL,), _Traversal.check_func_declaration)
+        if check_types:
+            register(
+                (
+                    CK.FUNCTION_DECL,
+                    CK.INTEGER_LITERAL,
+                    CK.CSTYLE_CAST_EXPR,
+                    CK.CXX_FUNCTIONAL_CAST_EXPR,
+                    CK.CXX_STATIC_CAST_EXPR,
+                    CK.CXX_REINTERPRET_CAST_EXPR,
+                ),
+                _Traversal.check_node_type,
+            )
+        if self.binary_operators:
+            register(
+                (CK.BINARY_OPERATOR, CK.COMPOUND_ASSIGNMENT_OPERATOR),
+                _Traversal.check_binary_operator,
+            )
+        # TODO: 检查形如 *(p+i) 的非法指针使用
+        if self.unary_operators:
+            register((CK.UNARY_OPERATOR,), _Traversal.check_unary_operator)
+        if grammar.disable_array:
+            register((CK.ARRAY_SUBSCRIPT_EXPR,), _record_as(ViolationKind.ARRAY))
+        if grammar.disable_branch:
+            register(
+                (CK.CONDITIONAL_OPERATOR, CK.IF_STMT, CK.SWITCH_STMT),
+                _record_as(ViolationKind.BRANCH),
+            )
+        if grammar.disable_goto:
+            register((CK.GOTO_STMT,), _record_as(ViolationKind.GOTO))
+        if grammar.disable_loop:
+            register(
+                (CK.WHILE_STMT, CK.FOR_STMT, CK.DO_STMT),
+                _record_as(ViolationKind.LOOP),
+            )
+        if grammar.disable_struct:
+            register((CK.STRUCT_DECL,), _record_as(ViolationKind.STRUCT))
+        if grammar.disable_class:
+            register((CK.CLASS_DECL,), _record_as(ViolationKind.CLASS))
+        # TODO: 检查违规使用系统函数（）
+
+        self.handlers = {kind: tuple(funcs) for kind, funcs in handlers.items()}
+        # 只启用了头文件规则。包含指令都是翻译单元的直接子节点，不必深入遍历
+        self.header_only = set(self.handlers) == {CK.INCLUSION_DIRECTIVE}
+        # 只启用了头文件、全局变量、结构体与类等声明层面的规则时，解析时跳过函数体。
+        # 函数体中仍可能声明局部的结构体/类或 extern 变量，由这些关键字判断是否需要完整解析
+        self.skip_function_bodies = (
+            bool(self.handlers)
+            and set(self.handlers) <= _DECLARATION_KINDS
+            and not check_types
+            and not grammar.disable_static_local_var
+        )
+        keywords = [
+            keyword
+            for keyword, enabled in (
+                (b"struct", grammar.disable_struct),
+                (b"class", grammar.disable_class),
+                (b"extern", check_linkage),
+            )
+            if enabled
+        ]
+        self.body_keywords = (
+            re.compile(rb"\b(?:" + b"|".join(keywords) + rb")\b") if keywords else None
+        )
+        # 可能报告的违规类型，所有类型都达到 max_per_kind 后即可结束遍历
+        self.kinds = frozenset(
+            kind
+            for kind, enabled in (
+                (ViolationKind.HEADER, CK.INCLUSION_DIRECTIVE in self.handlers),
+                (ViolationKind.INT64, grammar.disable_int64_or_larger),
+                (ViolationKind.POINTER, grammar.disable_pointer),
+                (ViolationKind.REFERENCE, grammar.disable_reference),
+                (ViolationKind.ARRAY, grammar.disable_array),
+                (ViolationKind.STRUCT, grammar.disable_struct),
+                (ViolationKind.CLASS, grammar.disable_class),
+                (ViolationKind.FUNCTION, grammar.disable_function),
+                (ViolationKind.BRANCH, grammar.disable_branch),
+                (ViolationKind.GOTO, grammar.disable_goto),
+                (ViolationKind.LOOP, grammar.disable_loop),
+                (ViolationKind.BIT_OPERATION, grammar.disable_bit_operation),
+                (ViolationKind.SYSTEM_CLASS, grammar.system_class.disable),
+                (ViolationKind.INTERNAL_GLOBAL, grammar.disable_internal_global_var),
+                (ViolationKind.EXTERNAL_GLOBAL, grammar.disable_external_global_var),
+                (ViolationKind.STATIC_LOCAL, grammar.disable_static_local_var),
+            )
+            if enabled
+        )
+        if config.report.aggregate and self.handlers:
+            # 宏展开是翻译单元的直接子节点，先于展开所在的函数被访问
+            self.handlers[CK.MACRO_INSTANTIATION] = (_Traversal.record_expansion,)
+        # 同一批文件包含的往往是同样的几十个头文件，判定结果只取决于文件名与配置
+        self.is_banned_header = lru_cache(maxsize=1024)(self._is_banned_header)
+
+    def _is_banned_header(self, filename: str) -> bool:
+        header = self.config.header
+        if (path := _resolve(filename)).is_relative_to(header.base_path):
+            # 本地头文件，和禁用的头文件重名可以接受
+            return False
+        name = path.name.lower()
+        if header.whitelist_set and name not in header.whitelist_set:
+            return True
+        return name in header.blacklist_set
+
+    def check(
+        self,
+        tu: CX.TranslationUnit,
+        keep_cursors: bool = False,
+        stats: CheckStats | None = None,
+        on_violation: OnViolation | None = None,
+        snippets: bool = False,
+    ) -> list[RuleViolation]:
+        if not self.handlers:
+            return []
+        if (
+            self.header_only
+            and not getattr(tu, "_uses_pch", False)
+            and not any(map(self.is_banned_header, user_includes(tu)))
+        ):
+            # 用户代码中没有包含任何禁用的头文件，不必遍历
+            return []
+        return _check_rule_sets(
+            tu, (self,), keep_cursors, stats, on_violation, snippets
+        )[0]
+
+
+def _check_rule_sets(
+    tu: CX.TranslationUnit,
+    rule_sets: Sequence[_RuleSet],
+    keep_cursors: bool = False,
+    stats: CheckStats | None = None,
+    on_violation: OnViolation | None = None,
+    snippets: bool = False,
+) -> list[list[RuleViolation]]:
+    """
+    在同一次遍历中执行多组规则，按 rule_sets 的顺序返回每组规则各自的违规。
+    同一节点上的处理函数先按组、再按注册顺序执行
+    """
+    # 只有调用者需要统计信息时才逐条规则计时
+    profile = stats is not None
+    stats = stats or CheckStats()
+    keywords = [
+        rules.body_keywords.pattern for rules in rule_sets if rules.body_keywords
+    ]
+    bodies = (
+        _SkippedBodies(tu, re.compile(b"|".join(keywords)))
+        if keywords and getattr(tu, "_function_bodies_skipped", False)
+        else None
+    )
+    # 跳过了函数体时，确定不需要重新解析之后才回调 on_violation；
+    # 合并重复的违规时，遍历结束后 count 才是最终的值
+    deferred = bodies is not None or any(
+        rules.config.report.aggregate for rules in rule_sets
     )
+    traversals = [
+        _Traversal(
+            rules, keep_cursors, stats, None if deferred else on_violation, snippets
+        )
+        for rules in rule_sets
+    ]
+    # 每组规则的所有违规类型都达到 max_per_kind 后，结束遍历
+    unfinished = sum(1 for rules in rule_sets if rules.kinds)
 
-    rule_violations: list[RuleViolation] = []
+    def finished() -> None:
+        nonlocal unfinished
+        unfinished -= 1
+        if unfinished == 0:
+            raise _StopWalk
 
-    def record_violation(
+    handlers: dict[CX.CursorKind, list[tuple[Handler, _Traversal]]] = {}
+    for traversal in traversals:
+        traversal.on_finished = finished
+        for kind, funcs in traversal.rules.handlers.items():
+            handlers.setdefault(kind, []).extend((func, traversal) for func in funcs)
+    descend = (
+        ChildVisit.CONTINUE
+        if all(rules.header_only for rules in rule_sets)
+        else ChildVisit.RECURSE
+    )
+    rule_time = stats.rule_time
+    rule_calls = stats.rule_calls
+
+    def visit(node: CX.Cursor, kind: CX.CursorKind, context: CX.Cursor):
+        for handler, traversal in handlers.get(kind, ()):
+            handler(traversal, node, context)
+        return descend
+
+    def profiled_visit(node: CX.Cursor, kind: CX.CursorKind, context: CX.Cursor):
+        for handler, traversal in handlers.get(kind, ()):
+            start = time.perf_counter()
+            handler(traversal, node, context)
+            name = handler.__name__
+            rule_time[name] = rule_time.get(name, 0.0) + (time.perf_counter() - start)
+            rule_calls[name] = rule_calls.get(name, 0) + 1
+        return descend
+
+    visitor = profiled_visit if profile else visit
+    if bodies is not None:
+        rule_visit = visitor
+
+        def visitor(node: CX.Cursor, kind: CX.CursorKind, context: CX.Cursor):
+            bodies.visit(node, kind)
+            return rule_visit(node, kind, context)
+
+    start = time.perf_counter()
+    try:
+        walk(tu, visitor, stats if profile else None)
+    except _StopWalk:
+        pass
+    # 提前结束时也要检查已经遍历过的部分中被跳过的函数体
+    if bodies is not None and bodies.may_hide_violations():
+        raise _FunctionBodiesNeeded
+    if deferred and on_violation:
+        for traversal in traversals:
+            for violation in traversal.violations:
+                on_violation(violation)
+    stats.walk_time += time.perf_counter() - start
+    return [traversal.violations for traversal in traversals]
+
+
+class _Traversal:
+    """对单个翻译单元的一次检查，保存遍历过程中的状态"""
+
+    rules: _RuleSet
+    config: Config
+    keep_cursors: bool
+    snippets: bool
+    stats: CheckStats
+    violations: list[RuleViolation]
+    on_violation: OnViolation | None
+    # 违规所在文件的内容，以文件名为键
+    sources: dict[str, bytes]
+    # check_var_type 的结果只取决于类型本身，同一个翻译单元中同样的类型会反复出现。
+    # CXType.data[0] 是 clang 内部唯一化的 QualType 指针，在翻译单元存活期间
+    # 唯一标识一个（带别名的）类型，用作键不需要任何额外的 libclang 调用。
+    # 不能只用规范类型作键：system_class 白名单匹配的是别名的拼写，例如 std::string
+    type_cache: dict[int | None, ViolationKind | None]
+    # [report] aggregate：合并键到该组的第一条违规；
+    # 宏展开的位置到 (展开的结束位置, 宏定义的位置)，以及每次展开中各类违规的条数
+    groups: dict[tuple, RuleViolation] | None
+    expansions: dict[tuple[str, int], tuple[int, tuple]]
+    expansion_counts: dict[tuple[str, int, ViolationKind], int]
+    # [report] max_per_kind / kinds_only：每类违规的上限、已记录的条数与已达到上限的类型
+    limit: int | None
+    kind_counts: dict[ViolationKind, int]
+    full: set[ViolationKind]
+    # 所有可能的违规类型都达到上限时调用
+    on_finished: Callable[[], None] | None
+
+    def __init__(
+        self,
+        rules: _RuleSet,
+        keep_cursors: bool,
+        stats: CheckStats,
+        on_violation: OnViolation | None = None,
+        snippets: bool = False,
+    ):
+        self.rules = rules
+        self.config = rules.config
+        self.keep_cursors = keep_cursors
+        self.snippets = snippets
+        self.stats = stats
+        self.violations = []
+        self.on_violation = on_violation
+        self.sources = {}
+        self.type_cache = {}
+        self.groups = {} if self.config.report.aggregate else None
+        self.expansions = {}
+        self.expansion_counts = {}
+        self.kind_counts = {}
+        self.full = set()
+        self.on_finished = None
+        report = self.config.report
+        self.limit = 1 if report.kinds_only else report.max_per_kind
+
+    def record(
+        self,
         kind: ViolationKind,
         node: CX.Cursor,
         context: CX.Cursor,
         extra_message: str = "",
     ):
-        rule_violations.append(RuleViolation(kind, node, context, extra_message))
+        if kind in self.full:
+            return
+        violation = RuleViolation.from_cursor(
+            kind, node, context, extra_message, self.keep_cursors
+        )
+        if self.groups is not None:
+            if (
+                first := self.groups.get(key := self.group_key(kind, node, violation))
+            ) is not None:
+                first.count += 1
+                return
+            self.groups[key] = violation
+        if self.snippets:
+            violation.snippet = self.snippet(node, violation)
+        self.violations.append(violation)
+        if self.on_violation:
+            self.on_violation(violation)
+
+        if self.config.report.stop_at_first:
+            self.full.update(ViolationKind)
+        elif (limit := self.limit) is not None:
+            self.kind_counts[kind] = count = self.kind_counts.get(kind, 0) + 1
+            if count < limit:
+                return
+            self.full.add(kind)
+        else:
+            return
+        if self.full >= self.rules.kinds and self.on_finished:
+            self.on_finished()
+
+    def group_key(
+        self, kind: ViolationKind, node: CX.Cursor, violation: RuleViolation
+    ) -> tuple:
+        """
+        宏展开产生的节点都位于展开处，libclang 也不提供宏定义中的拼写位置。
+        节点从某次宏展开处开始、整个在展开的范围内，且不是写在宏参数中时，
+        才认为它拼写在宏定义中，以 (宏定义的位置, 这是该次展开中第几条同类违规)
+        代替拼写位置，同一个宏各次展开中对应的违规合并为一条。
+        只是以宏开头的节点（例如 N > a）与宏参数中的节点按其自身的位置区分
+        """
+        location = (violation.file, violation.start_offset)
+        expansion = self.expansions.get(location)
+        if (
+            expansion is None
+            or violation.end_offset > expansion[0]
+            or get_file_offset(node.location) != node.location.offset
+        ):
+            return (kind, *location, violation.end_offset)
+        counter = (*location, kind)
+        self.expansion_counts[counter] = index = (
+            self.expansion_counts.get(counter, 0) + 1
+        )
+        return (kind, expansion[1], index)
+
+    def record_expansion(self, node: CX.Cursor, context: CX.Cursor):
+        extent = node.extent
+        if (file := extent.start.file) is None:
+            return
+        definition = node.referenced
+        if definition is not None and definition.location.file is not None:
+            location = (definition.location.file.name, definition.location.offset)
+        else:
+            location = (node.spelling,)
+        self.expansions[(file.name, extent.start.offset)] = (
+            extent.end.offset,
+            location,
+        )
+
+    def snippet(self, node: CX.Cursor, violation: RuleViolation) -> str | None:
+        """从翻译单元已加载的文件内容中截取违规处的源码，不再重新读取文件"""
+        if (source := self.sources.get(violation.file)) is None:
+            if (file := node.location.file) is None:
+                return None
+            source = self.sources[violation.file] = get_file_contents(
+                node.translation_unit, file
+            )
+        try:
+            return (
+                source[violation.start_offset : violation.end_offset]
+                .decode(self.config.common.encoding)
+                .replace("\r\n", "\n")
+            )
+        except UnicodeError:
+            return None
 
-    def check_inclusion(node: CX.Cursor, context: CX.Cursor):
+    def check_inclusion(self, node: CX.Cursor, context: CX.Cursor):
         assert node.kind == CK.INCLUSION_DIRECTIVE
 
         try:
@@ -93,16 +1157,12 @@ def find_all_violations(file: Path, config: Config):
             # 若包含的头文件不存在，则直接忽略
             return
 
-        if (path := Path(filename).resolve()).is_relative_to(config.header.base_path):
-            # 本地头文件，和禁用的头文件重名可以接受
-            return
+        if self.rules.is_banned_header(filename):
+            self.record(ViolationKind.HEADER, node, context)
 
-        if (
-            config.header.whitelist and path.name.lower() not in config.header.whitelist
-        ) or (path.name.lower() in config.header.blacklist):
-            record_violation(ViolationKind.HEADER, node, context)
-
-    def check_var_type(node_type: CX.Type) -> ViolationKind | None:
+    def check_var_type(self, node_type: CX.Type) -> ViolationKind | None:
+        config = self.config
+        check_var_type = self.check_var_type
         # 去除类型别名
         canonical_type = node_type.get_canonical()
 
@@ -167,18 +1227,32 @@ def find_all_violations(file: Path, config: Config):
                 ):
                     return ViolationKind.INT64
 
+    def check_type(self, node_type: CX.Type) -> ViolationKind | None:
+        key = node_type.data[0]
+        if key in self.type_cache:
+            self.stats.type_cache_hits += 1
+            return self.type_cache[key]
+        self.stats.type_cache_misses += 1
+        result = self.type_cache[key] = self.check_var_type(node_type)
+        return result
+
+    def check_node_type(self, node: CX.Cursor, context: CX.Cursor):
+        """检查变量、成员、函数声明以及字面量、类型转换表达式的类型"""
+        if type_violation_kind := self.check_type(node.type):
+            self.record(type_violation_kind, node, context)
+
+    @staticmethod
     def is_const(node_type: CX.Type) -> bool:
         """检查类型是否为常量"""
         if node_type.is_const_qualified():
             return True
         # 检查数组元素类型是否为常量
         if node_type.kind == CX.TypeKind.CONSTANTARRAY:
-            return is_const(node_type.get_array_element_type())
+            return _Traversal.is_const(node_type.get_array_element_type())
         return False
 
-    def check_var_declaration(node: CX.Cursor, context: CX.Cursor):
-        if type_violation_kind := check_var_type(node.type):
-            record_violation(type_violation_kind, node, context)
+    def check_var_linkage(self, node: CX.Cursor, context: CX.Cursor):
+        grammar = self.config.grammar
 
         # 静态全局/在匿名命名空间里的全局（除全局常变量）
 
@@ -186,114 +1260,31 @@ def find_all_violations(file: Path, config: Config):
         if node.access_specifier != CX.AccessSpecifier.INVALID:
             return
         if (
-            config.grammar.disable_internal_global_var
+            grammar.disable_internal_global_var
             and node.linkage == CX.LinkageKind.INTERNAL
-            and not is_const(node.type)
+            and not self.is_const(node.type)
         ):
-            record_violation(ViolationKind.INTERNAL_GLOBAL, node, context)
-        if config.grammar.disable_external_global_var and node.linkage in (
+            self.record(ViolationKind.INTERNAL_GLOBAL, node, context)
+        if grammar.disable_external_global_var and node.linkage in (
             CX.LinkageKind.EXTERNAL,
             CX.LinkageKind.UNIQUE_EXTERNAL,
         ):
-            record_violation(ViolationKind.EXTERNAL_GLOBAL, node, context)
+            self.record(ViolationKind.EXTERNAL_GLOBAL, node, context)
         if (
-            config.grammar.disable_static_local_var
+            grammar.disable_static_local_var
             and node.storage_class == CX.StorageClass.STATIC
             and node.linkage == CX.LinkageKind.NO_LINKAGE
         ):
-            record_violation(ViolationKind.STATIC_LOCAL, node, context)
-
-    def check_func_declaration(node: CX.Cursor, context: CX.Cursor):
-        if config.grammar.disable_function and node.spelling != "main":
-            record_violation(ViolationKind.FUNCTION, node, context)
-
-        if type_violation_kind := check_var_type(node.type):
-            record_violation(type_violation_kind, node, context)
-
-    def check_binary_operator(node: CX.Cursor, context: CX.Cursor):
-        match node.binary_operator:
-            case (
-                BO.Shl
-                | BO.ShlAssign
-                | BO.Shr
-                | BO.ShrAssign
-                | BO.And
-                | BO.AndAssign
-                | BO.Or
-                | BO.OrAssign
-                | BO.Xor
-                | BO.XorAssign
-            ):
-                if config.grammar.disable_bit_operation:
-                    record_violation(ViolationKind.BIT_OPERATION, node, context)
-            case BO.LAnd | BO.LE | BO.EQ | BO.NE | BO.LOr | BO.LT | BO.GT | BO.GE:
-                if config.grammar.disable_branch:
-                    record_violation(ViolationKind.BRANCH, node, context)
-
-    def check_unary_operator(node: CX.Cursor, context: CX.Cursor):
-        match node.unary_operator:
-            case UO.LNot:
-                if config.grammar.disable_branch:
-                    record_violation(ViolationKind.BRANCH, node, context)
-            case UO.Not:
-                if config.grammar.disable_bit_operation:
-                    record_violation(ViolationKind.BIT_OPERATION, node, context)
-
-    def traverse(node: CX.Cursor, context: CX.Cursor):
-        match node.kind:
-            case CK.INCLUSION_DIRECTIVE:
-                check_inclusion(node, context)
-            case CK.VAR_DECL | CK.FIELD_DECL:
-                check_var_declaration(node, context)
-            case CK.FUNCTION_DECL:
-                context = node
-                check_func_declaration(node, context)
-            case CK.BINARY_OPERATOR | CK.COMPOUND_ASSIGNMENT_OPERATOR:
-                check_binary_operator(node, context)
-            case CK.ARRAY_SUBSCRIPT_EXPR:
-                if config.grammar.disable_array:
-                    record_violation(ViolationKind.ARRAY, node, context)
-            case CK.CONDITIONAL_OPERATOR | CK.IF_STMT | CK.SWITCH_STMT:
-                if config.grammar.disable_branch:
-                    record_violation(ViolationKind.BRANCH, node, context)
-            case CK.GOTO_STMT:
-                if config.grammar.disable_goto:
-                    record_violation(ViolationKind.GOTO, node, context)
-            case CK.WHILE_STMT | CK.FOR_STMT | CK.DO_STMT:
-                if config.grammar.disable_loop:
-                    record_violation(ViolationKind.LOOP, node, context)
-            case CK.UNARY_OPERATOR:
-                # TODO: 检查形如 *(p+i) 的非法指针使用
-                check_unary_operator(node, context)
-            case CK.STRUCT_DECL:
-                context = node
-                if config.grammar.disable_struct:
-                    record_violation(ViolationKind.STRUCT, node, context)
-            case CK.CLASS_DECL:
-                context = node
-                if config.grammar.disable_class:
-                    record_violation(ViolationKind.CLASS, node, context)
-            case (
-                CK.INTEGER_LITERAL
-                | CK.CSTYLE_CAST_EXPR
-                | CK.CXX_FUNCTIONAL_CAST_EXPR
-                | CK.CXX_STATIC_CAST_EXPR
-                | CK.CXX_REINTERPRET_CAST_EXPR
-            ):
-                if vk := check_var_type(node.type):
-                    record_violation(vk, node, context)
-            # TODO: 检查违规使用系统函数（）
-
-        children = list(
-            child
-            for child in node.get_children()
-            if not child.location.is_in_system_header
-        )
+            self.record(ViolationKind.STATIC_LOCAL, node, context)
 
-        for child in children:
-            traverse(child, context)
+    def check_func_declaration(self, node: CX.Cursor, context: CX.Cursor):
+        if node.spelling != "main":
+            self.record(ViolationKind.FUNCTION, node, context)
 
-    assert tu.cursor
-    traverse(tu.cursor, tu.cursor)
+    def check_binary_operator(self, node: CX.Cursor, context: CX.Cursor):
+        if kind := self.rules.binary_operators.get(node.binary_operator.value):
+            self.record(kind, node, context)
 
-    return rule_violations
+    def check_unary_operator(self, node: CX.Cursor, context: CX.Cursor):
+        if kind := self.rules.unary_operators.get(node.unary_operator.value):
+            self.record(kind, node, context)
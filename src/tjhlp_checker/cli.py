@@ -1,5 +1,8 @@
+import json
+import tempfile
+from functools import partial
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 import sys
 
 try:
@@ -11,40 +14,292 @@ except ModuleNotFoundError:
     )
     sys.exit(1)
 
-from .checker import find_all_violations
 from .config import load_config
+from .stats import CheckStats
+from .report import REPORTERS, Reporter, TextReporter
+
+# 其余模块（以及 libclang）在用到时才导入，使 --help 与参数错误等情况尽快返回
+if TYPE_CHECKING:
+    from .checker import RuleViolation
 
 
 def cli_main(
-    file: Annotated[Path, typer.Argument(help="Path to input file", exists=True)],
+    files: Annotated[
+        list[Path],
+        typer.Argument(help="Paths to input files or directories", exists=True),
+    ],
     config_file: Annotated[
         Path, typer.Option(help="Path to TOML config file", prompt=True)
     ],
+    jobs: Annotated[
+        int, typer.Option("--jobs", "-j", help="Number of worker processes", min=1)
+    ] = 1,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory for caching results of unchanged files"),
+    ] = None,
+    pch_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory for precompiled common system headers"),
+    ] = None,
+    watch: Annotated[
+        bool,
+        typer.Option(help="Keep running and recheck files when they change"),
+    ] = False,
+    timeout: Annotated[
+        float | None,
+        typer.Option(help="Maximum seconds spent on each file", min=0),
+    ] = None,
+    memory_limit: Annotated[
+        int | None,
+        typer.Option(help="Address space limit of each worker in MiB", min=1),
+    ] = None,
+    project: Annotated[
+        bool,
+        typer.Option(
+            help="Treat each input as one project (a directory or "
+            "compile_commands.json) and report each header's violations once",
+        ),
+    ] = False,
+    aggregate: Annotated[
+        bool,
+        typer.Option(
+            help="Merge violations of one kind at the same location or from "
+            "the same macro into one, with an occurrence count",
+        ),
+    ] = False,
+    max_per_kind: Annotated[
+        int | None,
+        typer.Option(
+            help="Record at most this many violations of each kind per file",
+            min=1,
+        ),
+    ] = None,
+    kinds_only: Annotated[
+        bool,
+        typer.Option(help="Record only the first violation of each kind per file"),
+    ] = False,
+    stop_at_first: Annotated[
+        bool,
+        typer.Option(help="Stop checking a file at its first violation"),
+    ] = False,
+    output_format: Annotated[
+        str,
+        typer.Option(
+            "--format",
+            help="Output format: text, jsonl (one violation per line) or sarif",
+        ),
+    ] = "text",
+    profile: Annotated[
+        bool,
+        typer.Option(
+            help="Check serially and print timings and counters to stderr",
+        ),
+    ] = False,
+    profile_calls: Annotated[
+        bool,
+        typer.Option(
+            help="With --profile, also count libclang calls (inflates timings)",
+        ),
+    ] = False,
 ):
+    if output_format not in REPORTERS:
+        raise typer.BadParameter(
+            f"must be one of {', '.join(REPORTERS)}", param_hint="--format"
+        )
     with open(config_file, "rb") as f:
         config = load_config(f)
+    # 命令行选项覆盖配置文件中的 [report]
+    if aggregate:
+        config.report.aggregate = True
+    if max_per_kind is not None:
+        config.report.max_per_kind = max_per_kind
+    if kinds_only:
+        config.report.kinds_only = True
+    if stop_at_first:
+        config.report.stop_at_first = True
+
+    from .cache import ResultCache
+    from .checker import Checker
+    from .pch import PrecompiledHeaders
+    from .project import check_project, collect_files
+
+    if output_format == "text":
+        reporter: Reporter = TextReporter(sys.stdout, always=watch)
+    else:
+        reporter = REPORTERS[output_format](sys.stdout)
+
+    def report(file: Path, violations: "list[RuleViolation]") -> None:
+        for violation in violations:
+            reporter.violation(file, violation)
+        reporter.file_done(file, violations)
+
+    if project:
+        # 项目之间互不相关，逐个项目串行检查
+        pch = PrecompiledHeaders(pch_dir) if pch_dir else None
+        reporter.start()
+        for path in files:
+            for file, violations in check_project(
+                path, config, pch, snippets=True
+            ).items():
+                report(file, violations)
+        reporter.finish()
+        return
+
+    files = collect_files(files)
+    if watch:
+        # 监视模式下保留翻译单元在内存中增量重新解析，不使用缓存、PCH 与多进程
+        from .watch import Watcher
+
+        print("Watching for changes, press Ctrl+C to stop", file=sys.stderr)
+        reporter.start()
+        try:
+            Watcher(Checker(config, snippets=True), files).run(report)
+        except KeyboardInterrupt:
+            pass
+        reporter.finish()
+        return
+
+    cache = ResultCache(cache_dir) if cache_dir else None
+    pch = PrecompiledHeaders(pch_dir) if pch_dir else None
+    isolated = timeout is not None or memory_limit is not None
+    stats = CheckStats(count_libclang_calls=profile_calls) if profile else None
+    if profile and (jobs > 1 or isolated):
+        print(
+            "--profile checks files serially, ignoring --jobs/--timeout/--memory-limit",
+            file=sys.stderr,
+        )
+    reporter.start()
+    if profile or not (jobs > 1 or isolated):
+        # 串行检查时每发现一条违规就立即输出
+        checker = Checker(config, cache=cache, pch=pch, snippets=True)
+        for file in files:
+            violations = checker.check(
+                file, stats, on_violation=partial(reporter.violation, file)
+            )
+            reporter.file_done(file, violations)
+    elif isolated:
+        from .isolated import check_isolated
+
+        for file, violations in check_isolated(
+            files,
+            config,
+            jobs,
+            timeout,
+            memory_limit * 1024 * 1024 if memory_limit else None,
+            cache,
+            pch,
+            snippets=True,
+        ):
+            report(file, violations)
+    else:
+        from .parallel import check_parallel
+
+        for file, violations in check_parallel(
+            files, config, jobs, cache, pch, snippets=True
+        ):
+            report(file, violations)
+    reporter.finish()
+    if stats is not None:
+        print(stats.summary(), file=sys.stderr)
+
+
+def serve_main(
+    listen: Annotated[
+        str,
+        typer.Option(help="Unix socket path or [HOST:]PORT to listen on"),
+    ],
+    config_file: Annotated[
+        Path | None,
+        typer.Option(help="Default TOML config for requests without one"),
+    ] = None,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory for caching results of unchanged files"),
+    ] = None,
+    pch_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory for precompiled common system headers"),
+    ] = None,
+):
+    config = None
+    if config_file:
+        with open(config_file, "rb") as f:
+            config = load_config(f)
+
+    from .cache import ResultCache
+    from .pch import PrecompiledHeaders
+    from .server import serve
+
+    print(f"Listening on {listen}, press Ctrl+C to stop")
+    try:
+        serve(
+            listen,
+            config,
+            ResultCache(cache_dir) if cache_dir else None,
+            PrecompiledHeaders(pch_dir) if pch_dir else None,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def bench_main(
+    output: Annotated[
+        Path | None, typer.Option(help="Save the results to this JSON file")
+    ] = None,
+    compare: Annotated[
+        Path | None,
+        typer.Option(
+            help="Previous results to compare against; exit with 1 on regressions",
+            exists=True,
+        ),
+    ] = None,
+    corpus_dir: Annotated[
+        Path | None,
+        typer.Option(help="Directory for the generated corpus (temporary if unset)"),
+    ] = None,
+    repeat: Annotated[
+        int, typer.Option(help="Repetitions, the fastest one is kept", min=1)
+    ] = 3,
+    scale: Annotated[
+        int, typer.Option(help="Multiplier for the number of generated files", min=1)
+    ] = 1,
+    threshold: Annotated[
+        float, typer.Option(help="Relative slowdown reported as a regression", min=0)
+    ] = 0.2,
+):
+    from . import bench
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = bench.generate_corpus(corpus_dir or tmp, scale)
+        results = bench.run_benchmark(
+            corpus, repeat, lambda step: print(step, file=sys.stderr)
+        )
+    print(bench.format_results(results))
+    if output:
+        bench.save_results(results, output)
 
-    violations = find_all_violations(file, config)
-    if violations:
-        with open(file, "rb") as src:
-            src_text = src.read()
-            print(f"Found {len(violations)} violations in {file}:")
-
-            for violation in violations:
-                source_range = violation.cursor.extent
-                try:
-                    print(
-                        str(violation),
-                        src_text[source_range.start.offset : source_range.end.offset]
-                        .decode(config.common.encoding)
-                        .replace(
-                            "\r\n",
-                            "\n",
-                        ),
-                    )
-                except UnicodeError:
-                    print(str(violation), "<Encoding Error>")
+    # 导入时间超出预算时不论是否比较都以 1 退出
+    failed = False
+    for overrun in bench.over_budget(results["import"]):
+        print("Over budget:", overrun)
+        failed = True
+    if compare:
+        regressions = bench.compare(json.loads(compare.read_text()), results, threshold)
+        for regression in regressions:
+            print("Regression:", regression)
+        failed = failed or bool(regressions)
+    if failed:
+        raise typer.Exit(1)
 
 
 def main():
-    typer.run(cli_main)
+    # 检查文件的命令没有子命令名，这里手动分派其余的子命令
+    if sys.argv[1:2] == ["serve"]:
+        del sys.argv[1]
+        typer.run(serve_main)
+    elif sys.argv[1:2] == ["bench"]:
+        del sys.argv[1]
+        typer.run(bench_main)
+    else:
+        typer.run(cli_main)
@@ -0,0 +1,111 @@
+"""
+检查服务（tjhlp-checker serve）的轻量客户端
+
+只依赖标准库，也不导入本包的其他模块，可以单独复制出来作为脚本运行，
+启动时不必加载 pydantic 与 libclang。
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+
+def connect(address: str, timeout: float | None = None) -> socket.socket:
+    """地址格式与 server.parse_address 相同"""
+    if "/" in address or address.endswith(".sock"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        return sock
+    host, _, port = address.rpartition(":")
+    return socket.create_connection((host or "127.0.0.1", int(port)), timeout)
+
+
+def request(
+    address: str,
+    files: list[str],
+    config: str | None = None,
+    timeout: float | None = None,
+    snippets: bool = True,
+) -> list[dict]:
+    """发送一次检查请求，返回 [{"file": ..., "violations": [...]}, ...]"""
+    message: dict = {"files": files, "snippets": snippets}
+    if config is not None:
+        message["config"] = config
+    with connect(address, timeout) as sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(message).encode() + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise ConnectionError("server closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["results"]
+
+
+def print_violations(file: str, violations: list[dict]) -> None:
+    """与 tjhlp-checker 命令行的输出格式相同，源码片段由服务端随结果返回"""
+    if not violations:
+        return
+    print(f"Found {len(violations)} violations in {file}:")
+    for violation in violations:
+        title = f"{violation['kind']} ({violation['line']}, {violation['column']})"
+        if violation["kind"] in ("TIMEOUT", "CHECK_FAILED"):
+            detail = violation["extra_message"]
+        elif violation["snippet"] is None:
+            detail = "<Encoding Error>"
+        else:
+            detail = violation["snippet"]
+        # 旧版本的服务端不返回 count
+        if (count := violation.get("count", 1)) > 1:
+            detail += f" ({count} occurrences)"
+        print(title, detail)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="tjhlp-checker-client",
+        description="Check files with a running `tjhlp-checker serve`",
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="Paths to input files")
+    parser.add_argument(
+        "--address",
+        required=True,
+        help="Unix socket path or [HOST:]PORT the server listens on",
+    )
+    parser.add_argument(
+        "--config-file",
+        type=Path,
+        help="Path to TOML config file (defaults to the server's config)",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the raw JSON results"
+    )
+    parser.add_argument("--timeout", type=float, help="Timeout in seconds")
+    args = parser.parse_args()
+
+    config = args.config_file.read_text(encoding="utf-8") if args.config_file else None
+
+    try:
+        results = request(
+            args.address,
+            [str(file.resolve()) for file in args.files],
+            config,
+            args.timeout,
+        )
+    except (OSError, RuntimeError) as e:
+        print(f"tjhlp-checker-client: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+    for file, result in zip(args.files, results):
+        print_violations(str(file), result["violations"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import tomllib
 from typing import Self
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from typing import BinaryIO
 import codecs
 from pathlib import Path
@@ -25,6 +25,10 @@ class HeaderConfig(BaseModel):
     #  工作基准目录，用来判定头文件是否为系统头文件（用户自定义头文件不受blacklist/whitelist限制）
     base_path: Path = Path(".")
 
+    # 校验后生成的集合，供检查时 O(1) 查找；私有属性不参与序列化
+    _whitelist: frozenset[str] = PrivateAttr(frozenset())
+    _blacklist: frozenset[str] = PrivateAttr(frozenset())
+
     @model_validator(mode="after")
     def verify(self) -> Self:
         if self.blacklist and self.whitelist:
@@ -32,8 +36,18 @@ class HeaderConfig(BaseModel):
         self.base_path = self.base_path.resolve()
         if not self.base_path.exists():
             raise ValueError(f"base_path {self.base_path} does not exist")
+        self._whitelist = frozenset(self.whitelist)
+        self._blacklist = frozenset(self.blacklist)
         return self
 
+    @property
+    def whitelist_set(self) -> frozenset[str]:
+        return self._whitelist
+
+    @property
+    def blacklist_set(self) -> frozenset[str]:
+        return self._blacklist
+
 
 class GrammarConfig(BaseModel):
     disable_int64_or_larger: bool = False
@@ -58,10 +72,22 @@ class GrammarConfig(BaseModel):
     system_class: SystemClassConfig = SystemClassConfig()
 
 
+class ReportConfig(BaseModel):
+    # 同一位置（或同一个宏的各次展开）的同类违规合并为一条，记录出现次数
+    aggregate: bool = False
+    # 每个文件中每类违规最多记录的条数，所有启用的规则都达到上限后提前结束遍历
+    max_per_kind: int | None = Field(default=None, ge=1)
+    # 每类违规只记录第一条，即 max_per_kind = 1，用于只需要知道违规了哪些规则的场合
+    kinds_only: bool = False
+    # 只记录第一条违规后即结束遍历，用于只需要判断是否合规的场合
+    stop_at_first: bool = False
+
+
 class Config(BaseModel):
     common: CommonConfig = CommonConfig()
     header: HeaderConfig = HeaderConfig()
     grammar: GrammarConfig = GrammarConfig()
+    report: ReportConfig = ReportConfig()
 
 
 def load_config(file: BinaryIO):
@@ -0,0 +1,233 @@
+"""
+在可被终止的独立工作进程中检查，限制每个文件的运行时间与内存
+
+个别提交（深度递归的模板、巨大的宏展开等）会使 index.parse 运行数分钟或占用数 GB 内存。
+IsolatedChecker 把检查交给一个常驻的工作进程，超时后直接终止该进程并在下一次检查时
+重新启动，用 ViolationKind.TIMEOUT / CHECK_FAILED 记录代替检查结果，不会卡住整批检查。
+"""
+
+import multiprocessing
+import queue
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Self
+
+from .cache import ResultCache
+from .checker import Checker, RuleViolation, ViolationKind
+from .config import Config
+from .pch import PrecompiledHeaders
+
+
+def _serve(
+    conn: Connection,
+    config: Config,
+    cache: ResultCache | None,
+    pch: PrecompiledHeaders | None,
+    memory_limit: int | None,
+    snippets: bool,
+) -> None:
+    """
+    工作进程：启动完成后发送 None，之后依次接收文件路径，
+    返回 (True, 违规列表) 或 (False, 错误信息)
+    """
+    if memory_limit:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    checker = Checker(config, cache=cache, pch=pch, snippets=snippets)
+    conn.send(None)
+    while True:
+        try:
+            file = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, checker.check(file)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+def _failure(kind: ViolationKind, file: Path, message: str) -> RuleViolation:
+    return RuleViolation(kind, str(file), 0, 0, 0, 0, "", message)
+
+
+class IsolatedChecker:
+    """
+    timeout: 每个文件的最长检查时间（秒），包括解析
+    memory_limit: 工作进程的地址空间上限（字节，RLIMIT_AS），仅支持 POSIX 系统。
+    注意该上限包括 Python 解释器与 libclang 自身占用的空间
+
+    超时的文件得到一条 TIMEOUT 记录；工作进程崩溃（例如超出内存上限）或检查时
+    抛出异常的文件得到一条 CHECK_FAILED 记录，extra_message 中为原因。
+    """
+
+    config: Config
+    timeout: float | None
+    memory_limit: int | None
+    cache: ResultCache | None
+    pch: PrecompiledHeaders | None
+    snippets: bool
+
+    def __init__(
+        self,
+        config: Config,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+        cache: ResultCache | None = None,
+        pch: PrecompiledHeaders | None = None,
+        snippets: bool = False,
+    ) -> None:
+        if memory_limit:
+            try:
+                import resource  # noqa: F401
+            except ModuleNotFoundError:
+                raise ValueError(
+                    "memory_limit is only supported on POSIX systems"
+                ) from None
+        self.config = config
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cache = cache
+        self.pch = pch
+        self.snippets = snippets
+        self._process: BaseProcess | None = None
+        self._conn: Connection | None = None
+
+    def _start(self) -> Connection:
+        """启动工作进程；工作进程在启动过程中退出时抛出 EOFError"""
+        if self._process is not None and not self._process.is_alive():
+            # 工作进程在两次检查之间退出，重新启动
+            self._stop()
+        if self._conn is None:
+            self._conn, child = multiprocessing.Pipe()
+            # check_isolated 在多个线程中启动工作进程，不能使用 fork
+            self._process = multiprocessing.get_context("spawn").Process(
+                target=_serve,
+                args=(
+                    child,
+                    self.config,
+                    self.cache,
+                    self.pch,
+                    self.memory_limit,
+                    self.snippets,
+                ),
+                daemon=True,
+            )
+            self._process.start()
+            child.close()
+            # 等待工作进程完成启动，启动时间不计入第一个文件的超时
+            self._conn.recv()
+        return self._conn
+
+    def _stop(self) -> int | None:
+        """终止工作进程，返回其退出码"""
+        assert self._process and self._conn
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        exitcode = self._process.exitcode
+        self._process = self._conn = None
+        return exitcode
+
+    def _crashed(self, file: Path, when: str) -> RuleViolation:
+        return _failure(
+            ViolationKind.CHECK_FAILED,
+            file,
+            f"worker exited with code {self._stop()} {when}",
+        )
+
+    def check(self, file: Path | str) -> list[RuleViolation]:
+        file = Path(file)
+        try:
+            conn = self._start()
+        except EOFError:
+            # 例如内存上限小于加载 libclang 所需的空间
+            return [self._crashed(file, "during startup")]
+        start = time.perf_counter()
+        try:
+            conn.send(file)
+        except OSError:
+            return [self._crashed(file, "before the check")]
+        if not conn.poll(self.timeout):
+            self._stop()
+            return [
+                _failure(
+                    ViolationKind.TIMEOUT,
+                    file,
+                    f"check did not finish within {self.timeout}s",
+                )
+            ]
+        try:
+            ok, result = conn.recv()
+        except EOFError:
+            # 工作进程在检查途中退出，通常是因为超出了内存上限
+            return [self._crashed(file, f"after {time.perf_counter() - start:.1f}s")]
+        if not ok:
+            return [_failure(ViolationKind.CHECK_FAILED, file, result)]
+        return result
+
+    def kill(self) -> None:
+        """
+        可以在其他线程中调用：终止已经启动的工作进程，正在进行的 check 随即返回
+        CHECK_FAILED 记录，之后的 check 会重新启动工作进程
+        """
+        process = self._process
+        if process is not None and process.pid is not None:
+            process.kill()
+
+    def check_all(
+        self, files: Iterable[Path | str]
+    ) -> Iterator[tuple[Path, list[RuleViolation]]]:
+        for file in files:
+            yield Path(file), self.check(file)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._stop()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def check_isolated(
+    files: Iterable[Path | str],
+    config: Config,
+    jobs: int = 1,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+    cache: ResultCache | None = None,
+    pch: PrecompiledHeaders | None = None,
+    snippets: bool = False,
+) -> Iterator[tuple[Path, list[RuleViolation]]]:
+    """用 jobs 个 IsolatedChecker 并行检查，按输入顺序产出每个文件的结果"""
+    files = [Path(file) for file in files]
+    checkers: queue.SimpleQueue[IsolatedChecker] = queue.SimpleQueue()
+    created = [
+        IsolatedChecker(config, timeout, memory_limit, cache, pch, snippets)
+        for _ in range(jobs)
+    ]
+    for checker in created:
+        checkers.put(checker)
+
+    def check(file: Path) -> list[RuleViolation]:
+        # 线程只负责等待工作进程，每个线程同一时刻独占一个 IsolatedChecker
+        checker = checkers.get()
+        try:
+            return checker.check(file)
+        finally:
+            checkers.put(checker)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            yield from zip(files, executor.map(check, files))
+    finally:
+        for checker in created:
+            checker.close()
@@ -0,0 +1,28 @@
+"""
+违规类型。不依赖 libclang 与 pydantic，只需要这一枚举的工具导入时不必加载它们
+"""
+
+from enum import Enum
+
+
+class ViolationKind(Enum):
+    HEADER = 0
+    INT64 = 1
+    POINTER = 2
+    REFERENCE = 3
+    ARRAY = 4
+    STRUCT = 5
+    CLASS = 6
+    FUNCTION = 7
+    AUTO = 8
+    BRANCH = 9
+    GOTO = 10
+    LOOP = 11
+    BIT_OPERATION = 12
+    SYSTEM_CLASS = 13
+    INTERNAL_GLOBAL = 14
+    EXTERNAL_GLOBAL = 15
+    STATIC_LOCAL = 16
+    # 以下两项不是违规，而是文件未能完成检查时的结果，见 IsolatedChecker
+    TIMEOUT = 17
+    CHECK_FAILED = 18
@@ -1,8 +1,93 @@
-from clang.cindex import BaseEnumeration, Cursor, c_int
-from clang.cindex import functionList, conf  # type: ignore
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from ctypes import POINTER, byref, c_size_t, c_uint, c_void_p, string_at
 
-functionList.append(("clang_getCursorBinaryOperatorKind", [Cursor], c_int))
-functionList.append(("clang_getUnaryOperatorKindSpelling", [Cursor], c_int))
+from clang.cindex import BaseEnumeration, Cursor, File, TranslationUnit, c_int
+from clang.cindex import SourceLocation, c_object_p
+from clang.cindex import functionList, conf, register_function, _CXString  # type: ignore
+
+_FUNCTIONS = [
+    ("clang_getCursorBinaryOperatorKind", [Cursor], c_int),
+    ("clang_getUnaryOperatorKindSpelling", [Cursor], c_int),
+    ("clang_getClangVersion", [], _CXString, _CXString.from_result),
+    (
+        "clang_getFileContents",
+        [TranslationUnit, File, POINTER(c_size_t)],
+        c_void_p,
+    ),
+    (
+        "clang_getFileLocation",
+        [
+            SourceLocation,
+            POINTER(c_object_p),
+            POINTER(c_uint),
+            POINTER(c_uint),
+            POINTER(c_uint),
+        ],
+    ),
+]
+
+functionList.extend(_FUNCTIONS)
+# libclang may have been loaded before this module was imported (the package
+# imports it lazily), in which case the prototypes must be registered directly
+if conf.loaded:
+    for item in _FUNCTIONS:
+        register_function(conf.lib, item, False)
+
+
+def get_clang_version() -> str:
+    """
+    Retrieves the version string of the loaded libclang
+    """
+    return conf.lib.clang_getClangVersion()
+
+
+@contextmanager
+def count_calls(counter: dict[str, int]) -> Iterator[dict[str, int]]:
+    """
+    Counts calls to every registered libclang function into counter
+    while the context is active. Not thread-safe
+    """
+    lib = conf.lib
+    originals = {
+        name: lib.__dict__[name] for name, *_ in functionList if name in lib.__dict__
+    }
+
+    def wrap(name: str, function: Callable) -> Callable:
+        def wrapper(*args):
+            counter[name] = counter.get(name, 0) + 1
+            return function(*args)
+
+        return wrapper
+
+    for name, function in originals.items():
+        setattr(lib, name, wrap(name, function))
+    try:
+        yield counter
+    finally:
+        for name, function in originals.items():
+            setattr(lib, name, function)
+
+
+def get_file_contents(tu: TranslationUnit, file: File) -> bytes:
+    """
+    Retrieves the buffer of a file as loaded by the translation unit,
+    without reading it from disk again
+    """
+    size = c_size_t()
+    data = conf.lib.clang_getFileContents(tu, file, byref(size))
+    return string_at(data, size.value) if data else b""
+
+
+def get_file_offset(location: SourceLocation) -> int:
+    """
+    Retrieves the offset of the file location: tokens written in a macro
+    argument map to where the argument is written, while tokens from a macro
+    definition map to the macro expansion, like SourceLocation.offset
+    """
+    offset = c_uint()
+    conf.lib.clang_getFileLocation(location, None, None, None, byref(offset))
+    return offset.value
 
 
 class BinaryOperator(BaseEnumeration):
@@ -168,4 +253,11 @@ def unary_operator(self) -> UnaryOperator:
 
 Cursor.unary_operator = unary_operator  # type: ignore
 
-__all__ = ["BinaryOperator", "UnaryOperator"]
+__all__ = [
+    "BinaryOperator",
+    "UnaryOperator",
+    "count_calls",
+    "get_clang_version",
+    "get_file_contents",
+    "get_file_offset",
+]
@@ -0,0 +1,57 @@
+"""
+多进程并行检查：每个工作进程持有一个独立的 Checker（及其 clang Index）
+"""
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .cache import ResultCache
+from .checker import Checker, RuleViolation
+from .config import Config
+from .pch import PrecompiledHeaders
+
+# 工作进程内的检查器，由 _init_worker 创建
+_worker_checker: Checker | None = None
+
+
+def _init_worker(
+    config: Config,
+    cache: ResultCache | None,
+    pch: PrecompiledHeaders | None,
+    snippets: bool = False,
+) -> None:
+    global _worker_checker
+    _worker_checker = Checker(config, cache=cache, pch=pch, snippets=snippets)
+
+
+def _check_in_worker(file: Path) -> list[RuleViolation]:
+    assert _worker_checker
+    return _worker_checker.check(file)
+
+
+def check_parallel(
+    files: Iterable[Path | str],
+    config: Config,
+    jobs: int | None = None,
+    cache: ResultCache | None = None,
+    pch: PrecompiledHeaders | None = None,
+    snippets: bool = False,
+) -> Iterator[tuple[Path, list[RuleViolation]]]:
+    """
+    将文件分派到 jobs 个工作进程中检查（默认为 CPU 核数），按输入顺序产出每个文件的结果。
+    """
+    files = [Path(file) for file in files]
+    jobs = jobs or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(config, cache, pch, snippets),
+    ) as executor:
+        # 文件数远多于进程数时成批分派，减少进程间通信的次数
+        chunksize = max(1, len(files) // (jobs * 4))
+        yield from zip(
+            files, executor.map(_check_in_worker, files, chunksize=chunksize)
+        )
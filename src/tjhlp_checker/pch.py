@@ -0,0 +1,160 @@
+"""
+常用系统头文件的预编译头（PCH）缓存
+
+绝大多数作业都以相同的几行 #include <iostream> 等开头，每次解析都要重新处理这些头文件。
+这里把文件开头连续的、属于配置集合内的系统头文件包含指令作为前缀，为每种不同的前缀
+构建一个 PCH 并缓存到磁盘上，解析时通过 -include-pch 复用。
+由于 PCH 的内容恰好是文件自身的开头部分，文件中随后的同名包含指令会被 include guard
+跳过，解析结果与不使用 PCH 时相同。
+
+构建时出错（例如缺少某个系统头文件）的前缀不保存 PCH，只留下一个 .failed 标记，
+之后以这一前缀开头的文件都不使用 PCH。
+
+注意：clang 默认不校验系统头文件在 PCH 构建之后是否被修改，更换编译器或系统头文件后
+需要手动清空缓存目录。
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+import clang.cindex as CX
+
+from .config import CommonConfig
+from .libclang_patch import get_clang_version
+
+DEFAULT_HEADERS = (
+    "iostream",
+    "iomanip",
+    "cmath",
+    "cstdio",
+    "cstdlib",
+    "cstring",
+    "string",
+    "fstream",
+    "climits",
+    "cfloat",
+    "ctime",
+)
+
+# 文件开头允许出现在包含指令之间的空白与注释
+_SKIP = re.compile(rb"\s+|//[^\n]*|/\*.*?\*/", re.DOTALL)
+_INCLUDE = re.compile(rb"#[ \t]*include[ \t]*<([^>\n]+)>[ \t]*(?=\n|//|/\*|$)")
+
+
+def leading_includes(source: bytes) -> list[str]:
+    """文件开头连续的 #include <...> 指令所包含的头文件（跳过空白与注释）"""
+    headers = []
+    pos = 0
+    while pos < len(source):
+        if match := _SKIP.match(source, pos):
+            pos = match.end()
+        elif match := _INCLUDE.match(source, pos):
+            headers.append(match.group(1).decode("ascii", "replace").strip())
+            pos = match.end()
+        else:
+            break
+    return headers
+
+
+class PrecompiledHeaders:
+    directory: Path
+    headers: frozenset[str]
+
+    def __init__(
+        self, directory: Path | str, headers: Iterable[str] = DEFAULT_HEADERS
+    ) -> None:
+        """headers: 允许被预编译的系统头文件"""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.headers = frozenset(headers)
+
+    def prefix(self, source: bytes) -> list[str]:
+        """文件开头可以由 PCH 代替的最长一段包含指令"""
+        prefix = []
+        for header in leading_includes(source):
+            if header not in self.headers:
+                break
+            prefix.append(header)
+        return prefix
+
+    def arguments(
+        self,
+        index: CX.Index,
+        file: Path,
+        source: bytes,
+        common: CommonConfig,
+        args: list[str],
+    ) -> list[str]:
+        """
+        返回解析该文件时需要追加的参数；没有可用的前缀时返回空列表。
+        args 为解析时使用的其余参数，必须与构建 PCH 时一致
+        """
+        # 头文件单独检查时的语言不确定，不使用 PCH
+        if file.suffix.lower() in (".h", ".hpp") or not (prefix := self.prefix(source)):
+            return []
+        language = "c" if file.suffix.lower() == ".c" else "c++"
+
+        digest = hashlib.sha256()
+        for part in (
+            get_clang_version(),
+            language,
+            common.encoding,
+            str(common.is_32bit),
+            *args,
+        ):
+            digest.update(part.encode() + b"\0")
+        digest.update("\n".join(prefix).encode())
+        path = self.directory / f"{digest.hexdigest()}.pch"
+
+        if path.with_suffix(".failed").exists():
+            return []
+        if not path.exists() and not self._build(index, language, prefix, path, args):
+            return []
+        return ["-include-pch", str(path)]
+
+    def invalidate(self, args: list[str]) -> None:
+        """删除 arguments 返回的 PCH，例如在它无法被加载时"""
+        if "-include-pch" in args:
+            Path(args[args.index("-include-pch") + 1]).unlink(missing_ok=True)
+
+    def _build(
+        self,
+        index: CX.Index,
+        language: str,
+        prefix: list[str],
+        path: Path,
+        args: list[str],
+    ) -> bool:
+        """返回是否成功构建"""
+        header = path.with_suffix(".hpp")
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as f:
+            f.write("".join(f"#include <{name}>\n" for name in prefix))
+        os.replace(f.name, header)
+
+        tu = index.parse(
+            str(header),
+            args=["-x", f"{language}-header", *args],
+            options=CX.TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
+            | CX.TranslationUnit.PARSE_INCOMPLETE,
+        )
+        if any(
+            diagnostic.severity >= CX.Diagnostic.Error for diagnostic in tu.diagnostics
+        ):
+            # 出错的 PCH 可以被加载而不报告任何与 PCH 有关的错误，但内容不完整
+            path.with_suffix(".failed").touch()
+            return False
+        # 先保存到临时文件再替换，避免并行的工作进程读到写了一半的 PCH
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            tu.save(tmp)
+            os.replace(tmp, path)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+        return True
@@ -0,0 +1,150 @@
+"""
+项目模式：把一个目录或 compile_commands.json 中的多个源文件作为同一份作业检查
+
+每个源文件只解析一次；本地头文件中的违规在包含它的各个翻译单元中都会被找到，
+按 (文件, 位置, 类型) 去重后只报告一次。没有被任何源文件包含的头文件单独检查。
+"""
+
+import json
+import shlex
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+
+from .checker import Checker, RuleViolation, user_includes
+from .config import Config
+from .pch import PrecompiledHeaders
+from .stats import CheckStats
+
+SOURCE_SUFFIXES = (".c", ".cc", ".cpp", ".cxx", ".h", ".hpp")
+HEADER_SUFFIXES = (".h", ".hpp")
+
+# compile_commands.json 中会影响预处理结果、需要保留的参数
+_PATH_OPTIONS = ("-I", "-isystem", "-iquote", "-include")
+_VALUE_OPTIONS = ("-D", "-U")
+
+
+def collect_files(paths: list[Path]) -> list[Path]:
+    """展开目录参数，收集其中的所有 C/C++ 源文件"""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    file
+                    for file in path.rglob("*")
+                    if file.is_file() and file.suffix.lower() in SOURCE_SUFFIXES
+                )
+            )
+        else:
+            files.append(path)
+    return files
+
+
+@dataclass
+class Project:
+    """
+    units: 要解析的源文件及其额外的编译参数
+    headers: 单独检查的头文件，已被某个源文件包含的会被跳过
+    """
+
+    units: list[tuple[Path, list[str]]] = field(default_factory=list)
+    headers: list[Path] = field(default_factory=list)
+
+    @classmethod
+    def from_directory(cls, directory: Path | str) -> "Project":
+        project = cls()
+        for file in collect_files([Path(directory)]):
+            if file.suffix.lower() in HEADER_SUFFIXES:
+                project.headers.append(file)
+            else:
+                project.units.append((file, []))
+        return project
+
+    @classmethod
+    def from_compile_commands(cls, path: Path | str) -> "Project":
+        project = cls()
+        seen = set()
+        for entry in json.loads(Path(path).read_text(encoding="utf-8")):
+            directory = Path(entry["directory"])
+            file = (directory / entry["file"]).resolve()
+            # 同一文件可能以不同参数出现多次，只检查第一次
+            if file in seen:
+                continue
+            seen.add(file)
+            arguments = entry.get("arguments") or shlex.split(entry["command"])
+            project.units.append((file, _filter_arguments(arguments[1:], directory)))
+        return project
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Project":
+        """path 为目录或 compile_commands.json"""
+        path = Path(path)
+        if path.is_dir():
+            return cls.from_directory(path)
+        return cls.from_compile_commands(path)
+
+
+def _filter_arguments(arguments: list[str], directory: Path) -> list[str]:
+    """只保留包含路径与宏定义，相对路径按条目的 directory 转换为绝对路径"""
+    kept = []
+    arguments = iter(arguments)
+    for argument in arguments:
+        for option in _PATH_OPTIONS + _VALUE_OPTIONS:
+            if argument == option:
+                value = next(arguments, "")
+            elif argument.startswith(option) and option != "-include":
+                value = argument.removeprefix(option)
+            else:
+                continue
+            if option in _PATH_OPTIONS:
+                value = str(directory / value)
+            kept += [option, value]
+            break
+        else:
+            if argument.startswith("-std="):
+                kept.append(argument)
+    return kept
+
+
+def check_project(
+    project: Project | Path | str,
+    config: Config,
+    pch: PrecompiledHeaders | None = None,
+    stats: CheckStats | None = None,
+    snippets: bool = False,
+) -> dict[Path, list[RuleViolation]]:
+    """
+    返回每个文件（绝对路径）中的违规，包括被源文件包含的本地头文件。
+    每个源文件都有一项（可能为空），按检查顺序排列
+    """
+    if not isinstance(project, Project):
+        project = Project.load(project)
+    checker = Checker(config, pch=pch, snippets=snippets)
+    results: dict[Path, list[RuleViolation]] = {}
+    seen: set[tuple[Path, int, int, object]] = set()
+    included: set[Path] = set()
+    # 同一文件中的违规往往很多，每个路径只解析一次
+    resolve = cache(lambda filename: Path(filename).resolve())
+
+    def add(file: Path, violations: list[RuleViolation]) -> None:
+        results.setdefault(resolve(str(file)), [])
+        for violation in violations:
+            path = resolve(violation.file)
+            key = (path, violation.start_offset, violation.end_offset, violation.kind)
+            if key not in seen:
+                seen.add(key)
+                results.setdefault(path, []).append(violation)
+
+    for file, arguments in project.units:
+        if stats is not None:
+            stats.files += 1
+        tu = checker.parse(file, extra_args=arguments, stats=stats)
+        violations = checker.check_translation_unit(tu, stats)
+        included.update(map(resolve, user_includes(tu)))
+        add(file, violations)
+
+    for header in project.headers:
+        if resolve(str(header)) not in included:
+            add(header, checker.check(header, stats))
+    return results
@@ -0,0 +1,150 @@
+"""
+检查结果的输出格式：纯文本、JSON Lines 与 SARIF
+
+JSON Lines 与 SARIF 在每发现一条违规时就立即写出，便于下游在整批检查结束前开始处理。
+"""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
+from .kinds import ViolationKind
+
+if TYPE_CHECKING:
+    from .checker import RuleViolation
+
+# 不对应源码位置的检查结果
+_STATUS_KINDS = (ViolationKind.TIMEOUT, ViolationKind.CHECK_FAILED)
+
+
+class Reporter:
+    """
+    调用顺序：start()，然后对每个文件先对其每条违规调用 violation()，
+    再调用一次 file_done()，最后调用 finish()
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def start(self) -> None:
+        pass
+
+    def violation(self, file: Path, violation: "RuleViolation") -> None:
+        pass
+
+    def file_done(self, file: Path, violations: "list[RuleViolation]") -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class TextReporter(Reporter):
+    """每个文件检查完后输出其违规数与每条违规处的源码"""
+
+    def __init__(self, stream: TextIO, always: bool = False) -> None:
+        """always: 没有违规时也输出一行，便于在监视模式下确认文件已被重新检查"""
+        super().__init__(stream)
+        self.always = always
+
+    def file_done(self, file: Path, violations: "list[RuleViolation]") -> None:
+        if not violations:
+            if self.always:
+                print(f"No violations in {file}", file=self.stream)
+            return
+        print(f"Found {len(violations)} violations in {file}:", file=self.stream)
+        for violation in violations:
+            if violation.kind in _STATUS_KINDS:
+                detail = violation.extra_message
+            elif violation.snippet is None:
+                detail = "<Encoding Error>"
+            else:
+                detail = violation.snippet
+            if violation.count > 1:
+                detail += f" ({violation.count} occurrences)"
+            print(str(violation), detail, file=self.stream)
+
+
+class JsonLinesReporter(Reporter):
+    """每条违规一行 JSON，额外带有 checked_file 字段表示被检查的文件"""
+
+    def violation(self, file: Path, violation: "RuleViolation") -> None:
+        self.stream.write(
+            json.dumps(
+                {"checked_file": str(file)} | violation.to_dict(), ensure_ascii=False
+            )
+            + "\n"
+        )
+        self.stream.flush()
+
+
+class SarifReporter(Reporter):
+    """
+    SARIF 2.1.0 格式。整个输出是一个 JSON 文档，结果数组中的元素在发现时即写出，
+    finish() 时补上结尾
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self.first = True
+
+    def start(self) -> None:
+        driver = {
+            "name": "tjhlp-checker",
+            "informationUri": "https://github.com/Maoyao233/tjhlp-checker",
+            "rules": [{"id": kind.name} for kind in ViolationKind],
+        }
+        head = json.dumps(
+            {
+                "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+                "version": "2.1.0",
+                "runs": [{"tool": {"driver": driver}, "results": []}],
+            }
+        )
+        # 去掉结尾的 "]}]}"，之后的结果直接追加到 results 数组中
+        self.stream.write(head.removesuffix("]}]}"))
+        self.stream.flush()
+
+    def violation(self, file: Path, violation: "RuleViolation") -> None:
+        location: dict = {
+            "artifactLocation": {"uri": Path(violation.file or file).resolve().as_uri()}
+        }
+        if violation.kind not in _STATUS_KINDS:
+            region: dict = {
+                "startLine": violation.line,
+                "startColumn": violation.column,
+                "byteOffset": violation.start_offset,
+                "byteLength": violation.end_offset - violation.start_offset,
+            }
+            if violation.snippet is not None:
+                region["snippet"] = {"text": violation.snippet}
+            location["region"] = region
+
+        message = violation.kind.name
+        if violation.extra_message:
+            message += f": {violation.extra_message}"
+        result = {
+            "ruleId": violation.kind.name,
+            "level": "error",
+            "message": {"text": message},
+            "locations": [{"physicalLocation": location}],
+        }
+        if violation.count > 1:
+            result["occurrenceCount"] = violation.count
+        if violation.context:
+            result["locations"][0]["logicalLocations"] = [{"name": violation.context}]
+
+        self.stream.write(("" if self.first else ",") + json.dumps(result))
+        self.stream.flush()
+        self.first = False
+
+    def finish(self) -> None:
+        self.stream.write("]}]}\n")
+        self.stream.flush()
+
+
+REPORTERS: dict[str, type[Reporter]] = {
+    "text": TextReporter,
+    "jsonl": JsonLinesReporter,
+    "sarif": SarifReporter,
+}
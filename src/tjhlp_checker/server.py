@@ -0,0 +1,195 @@
+"""
+常驻的检查服务：进程启动、依赖导入、libclang 加载与配置校验只发生一次，
+之后通过 Unix socket 或本地 TCP 端口接收检查请求。
+
+协议为按行分隔的 JSON，一个连接上可以依次发送多个请求，每个请求对应一行响应：
+
+    请求: {"files": ["/abs/path/main.cpp", ...], "config": "<TOML 文本，可省略>",
+           "snippets": true}
+    响应: {"results": [{"file": "...", "violations": [RuleViolation.to_dict(), ...]}]}
+    出错: {"error": "..."}
+
+省略 config 时使用启动服务时指定的默认配置；snippets 为 true 时违规记录附带
+源码片段，默认不附带。请求中的相对路径以及配置中的
+base_path 都相对于服务进程的工作目录解析，客户端应当发送绝对路径。
+"""
+
+import json
+import os
+import socketserver
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+
+from .cache import ResultCache
+from .checker import Checker
+from .config import Config, load_config
+from .pch import PrecompiledHeaders
+
+
+def _lru_get[K, V](
+    cache: OrderedDict[K, V], key: K, create: Callable[[], V], maxsize: int
+) -> V:
+    """取出 cache[key]，不存在时创建；超出 maxsize 时丢弃最久未使用的项"""
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = cache[key] = create()
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+    return value
+
+
+class CheckService:
+    """
+    按配置保留已经构造好的 Checker，处理解码后的请求。
+    max_checkers: 最多保留的 Checker（以及已校验的配置）数，超出时丢弃最久未使用的，
+    避免常驻服务因客户端发送的不同配置而无限增长
+    """
+
+    default_config: Config | None
+    cache: ResultCache | None
+    pch: PrecompiledHeaders | None
+    max_checkers: int
+    # 以 TOML 文本为键，避免重复校验相同的配置
+    configs: OrderedDict[str, Config]
+    # 以规范化的配置为键，内容相同、写法不同的配置共用同一个 Checker
+    checkers: OrderedDict[tuple[str, bool], Checker]
+
+    def __init__(
+        self,
+        default_config: Config | None = None,
+        cache: ResultCache | None = None,
+        pch: PrecompiledHeaders | None = None,
+        max_checkers: int = 16,
+    ) -> None:
+        self.default_config = default_config
+        self.cache = cache
+        self.pch = pch
+        self.max_checkers = max_checkers
+        self.configs = OrderedDict()
+        self.checkers = OrderedDict()
+        # libclang 的 Index 不保证线程安全，同一时刻只检查一个文件
+        self.lock = threading.Lock()
+
+    def checker(self, config_text: str | None, snippets: bool = False) -> Checker:
+        if config_text is None:
+            if self.default_config is None:
+                raise ValueError("no config given and the server has no default")
+            config = self.default_config
+        else:
+            config = _lru_get(
+                self.configs,
+                config_text,
+                lambda: load_config(BytesIO(config_text.encode())),
+                self.max_checkers,
+            )
+
+        return _lru_get(
+            self.checkers,
+            (config.model_dump_json(), snippets),
+            lambda: Checker(config, cache=self.cache, pch=self.pch, snippets=snippets),
+            self.max_checkers,
+        )
+
+    def handle(self, request: dict) -> dict:
+        try:
+            files = request["files"]
+            if not isinstance(files, list) or not all(
+                isinstance(file, str) for file in files
+            ):
+                raise ValueError('"files" must be a list of paths')
+            snippets = request.get("snippets", False)
+            if not isinstance(snippets, bool):
+                raise ValueError('"snippets" must be a boolean')
+            results = []
+            with self.lock:
+                checker = self.checker(request.get("config"), snippets)
+                for file in files:
+                    violations = checker.check(Path(file))
+                    results.append(
+                        {
+                            "file": file,
+                            "violations": [
+                                violation.to_dict() for violation in violations
+                            ],
+                        }
+                    )
+            return {"results": results}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_UnixServer | _TCPServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response = {"error": f"invalid request: {e}"}
+            else:
+                response = self.server.service.handle(request)
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    service: CheckService
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    service: CheckService
+
+
+def parse_address(address: str) -> str | tuple[str, int]:
+    """
+    含有路径分隔符或以 .sock 结尾的地址视为 Unix socket，
+    否则为 [HOST:]PORT，HOST 默认为 127.0.0.1
+    """
+    if "/" in address or address.endswith(".sock"):
+        return address
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def create_server(address: str, service: CheckService) -> socketserver.BaseServer:
+    parsed = parse_address(address)
+    if isinstance(parsed, str):
+        # 清理上次异常退出时残留的 socket 文件，不删除其他类型的文件
+        try:
+            if stat.S_ISSOCK(os.stat(parsed).st_mode):
+                os.unlink(parsed)
+        except FileNotFoundError:
+            pass
+        server: _UnixServer | _TCPServer = _UnixServer(parsed, _Handler)
+    else:
+        server = _TCPServer(parsed, _Handler)
+    server.service = service
+    return server
+
+
+def serve(
+    address: str,
+    config: Config | None = None,
+    cache: ResultCache | None = None,
+    pch: PrecompiledHeaders | None = None,
+) -> None:
+    """在 address 上提供检查服务，直到被中断"""
+    with create_server(address, CheckService(config, cache, pch)) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if isinstance(address := server.server_address, str):
+                Path(address).unlink(missing_ok=True)
@@ -0,0 +1,77 @@
+"""
+检查过程中的统计信息
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CheckStats:
+    """
+    传给 Checker.check / find_all_violations 后，在检查过程中累加填充；
+    同一个对象可以跨多个文件累计。时间单位均为秒
+    """
+
+    files: int = 0
+    # index.parse（包括构建或加载 PCH）
+    parse_time: float = 0.0
+    # 遍历与执行所有规则的总时间
+    walk_time: float = 0.0
+    nodes_visited: int = 0
+    # 在顶层被剪枝的系统头文件中的节点（不含其后代）
+    nodes_skipped_system: int = 0
+
+    # 以处理函数名为键，每条规则的累计时间与调用次数
+    rule_time: dict[str, float] = field(default_factory=dict)
+    rule_calls: dict[str, int] = field(default_factory=dict)
+
+    # 为 True 时统计每个 libclang 函数的调用次数。每次调用都要经过一层 Python 包装，
+    # 会使各项时间明显偏大，也不能与其他线程中的检查同时进行
+    count_libclang_calls: bool = False
+    libclang_calls: dict[str, int] = field(default_factory=dict)
+
+    # 跳过函数体解析后，因函数体中可能有违规而完整重新解析的次数
+    function_body_fallbacks: int = 0
+
+    # ResultCache
+    result_cache_hits: int = 0
+    result_cache_misses: int = 0
+
+    # check_var_type 的按类型缓存
+    type_cache_hits: int = 0
+    type_cache_misses: int = 0
+
+    @property
+    def type_cache_hit_rate(self) -> float:
+        total = self.type_cache_hits + self.type_cache_misses
+        return self.type_cache_hits / total if total else 0.0
+
+    def summary(self) -> str:
+        """便于阅读的多行文本"""
+        lines = [
+            f"files                 {self.files}",
+            f"parse time            {self.parse_time:.3f}s",
+            f"walk time             {self.walk_time:.3f}s",
+            f"nodes visited         {self.nodes_visited}",
+            f"system nodes skipped  {self.nodes_skipped_system}",
+            f"body fallbacks        {self.function_body_fallbacks}",
+            f"result cache          {self.result_cache_hits} hits, "
+            f"{self.result_cache_misses} misses",
+            f"type cache            {self.type_cache_hits} hits, "
+            f"{self.type_cache_misses} misses ({self.type_cache_hit_rate:.1%})",
+        ]
+        if self.rule_time:
+            lines.append("rules:")
+            for name, seconds in sorted(
+                self.rule_time.items(), key=lambda item: item[1], reverse=True
+            ):
+                lines.append(
+                    f"  {name:<24}{seconds:.3f}s  {self.rule_calls[name]} calls"
+                )
+        if self.libclang_calls:
+            lines.append(f"libclang calls        {sum(self.libclang_calls.values())}")
+            for name, count in sorted(
+                self.libclang_calls.items(), key=lambda item: item[1], reverse=True
+            ):
+                lines.append(f"  {name:<40}{count}")
+        return "\n".join(lines)
@@ -0,0 +1,88 @@
+"""
+基于单次 clang_visitChildren 的 AST 遍历引擎
+
+整个翻译单元只调用一次 clang_visitChildren（CXChildVisit_Recurse），
+由 libclang 驱动先序遍历，Python 侧只维护一个祖先栈用来推导每个节点的上下文。
+相比递归地对每个节点调用 get_children，既不会触发 RecursionError，
+也不会为每个节点创建子节点列表。
+"""
+
+from collections.abc import Callable
+from enum import IntEnum
+
+import clang.cindex as CX
+from clang.cindex import CursorKind as CK
+from clang.cindex import callbacks, conf  # type: ignore
+
+# functionList 必须在 libclang 首次加载前补充完整
+from . import libclang_patch  # noqa: F401
+from .stats import CheckStats
+
+
+class ChildVisit(IntEnum):
+    """与 libclang 的 CXChildVisitResult 一一对应"""
+
+    BREAK = 0
+    CONTINUE = 1
+    RECURSE = 2
+
+
+# 这些节点会成为自身及其所有后代节点的上下文
+CONTEXT_KINDS = frozenset({CK.FUNCTION_DECL, CK.STRUCT_DECL, CK.CLASS_DECL})
+
+# visit(node, kind, context) 返回 None 等价于 ChildVisit.RECURSE
+Visit = Callable[[CX.Cursor, CX.CursorKind, CX.Cursor], ChildVisit | None]
+
+
+def walk(tu: CX.TranslationUnit, visit: Visit, stats: CheckStats | None = None) -> int:
+    """
+    先序遍历翻译单元中所有不在系统头文件里的节点，返回访问过的节点数。
+    stats: 若传入，累加访问与剪枝的节点数
+
+    系统头文件只在顶层剪枝：用户代码中的节点，其后代也都在用户代码中
+    """
+    root = tu.cursor
+    assert root
+
+    # 祖先栈，元素为 (节点的原始字节, 节点子树的上下文)。
+    # libclang 回调时传入的 parent 与该节点被访问时传入的 cursor 逐字节相同，
+    # 因此直接比较原始字节即可，不必为每个节点调用 clang_equalCursors
+    stack: list[tuple[bytes, CX.Cursor]] = [(bytes(root), root)]
+    visited = 0
+    skipped = 0
+    error: BaseException | None = None
+
+    def visitor(node: CX.Cursor, parent: CX.Cursor, _) -> int:
+        nonlocal visited, skipped, error
+        try:
+            parent_key = bytes(parent)
+            while stack[-1][0] != parent_key:
+                stack.pop()
+
+            if len(stack) == 1 and node.location.is_in_system_header:
+                skipped += 1
+                return ChildVisit.CONTINUE
+
+            # 使翻译单元在 cursor 存活期间不被回收，与 get_children 的行为一致
+            node._tu = tu
+            visited += 1
+            kind = node.kind
+            context = node if kind in CONTEXT_KINDS else stack[-1][1]
+
+            result = visit(node, kind, context)
+            if result is None or result == ChildVisit.RECURSE:
+                stack.append((bytes(node), context))
+                return ChildVisit.RECURSE
+            return result
+        except BaseException as e:
+            # ctypes 回调中抛出的异常会被吞掉，记下后终止遍历再重新抛出
+            error = e
+            return ChildVisit.BREAK
+
+    conf.lib.clang_visitChildren(root, callbacks["cursor_visit"](visitor), None)
+    if stats is not None:
+        stats.nodes_visited += visited
+        stats.nodes_skipped_system += skipped
+    if error is not None:
+        raise error
+    return visited
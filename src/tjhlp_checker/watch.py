@@ -0,0 +1,90 @@
+"""
+监视模式：在内存中保留每个文件的翻译单元，文件或其包含的头文件变化后
+增量地重新解析，只重新检查发生变化的文件
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import clang.cindex as CX
+
+from .checker import Checker, RuleViolation
+
+
+def _stamps(filenames: Iterable[str]) -> dict[str, int | None]:
+    """文件的修改时间，不存在的文件记为 None"""
+    stamps = {}
+    for filename in filenames:
+        try:
+            stamps[filename] = os.stat(filename).st_mtime_ns
+        except OSError:
+            stamps[filename] = None
+    return stamps
+
+
+def _reparse(tu: CX.TranslationUnit) -> bool:
+    """
+    与 tu.reparse() 相同，但返回是否成功。tu.reparse() 忽略返回值，
+    失败后的翻译单元已不可用，继续访问会使进程崩溃
+    """
+    return CX.conf.lib.clang_reparseTranslationUnit(tu, 0, None, 0) == 0
+
+
+class Watcher:
+    checker: Checker
+    files: list[Path]
+    units: dict[Path, CX.TranslationUnit]
+    # 每个文件及其包含的所有头文件在上一次解析时的修改时间
+    stamps: dict[Path, dict[str, int | None]]
+
+    def __init__(self, checker: Checker, files: Iterable[Path | str]) -> None:
+        self.checker = checker
+        self.files = [Path(file) for file in files]
+        self.units = {}
+        self.stamps = {}
+
+    def check(self, file: Path) -> list[RuleViolation]:
+        """
+        首次解析文件，或在文件变化后增量地重新解析，然后检查。
+        文件不存在时抛出 CX.TranslationUnitLoadError
+        """
+        tu = self.units.pop(file, None)
+        if tu is not None and not (file.exists() and _reparse(tu)):
+            # 重新解析失败的翻译单元只能丢弃，重新完整解析
+            tu = None
+        if tu is None:
+            # 跳过函数体时检查可能需要完整地重新解析，而那个翻译单元不会被保留，
+            # 之后每次都要从头解析，因此总是解析函数体
+            tu = self.checker.parse(file, reparsable=True, skip_function_bodies=False)
+        self.units[file] = tu
+        self.stamps[file] = _stamps(
+            [str(file), *(include.include.name for include in tu.get_includes())]
+        )
+        return self.checker.check_translation_unit(tu)
+
+    def changed(self) -> list[Path]:
+        return [
+            file
+            for file in self.files
+            if file not in self.stamps
+            or _stamps(self.stamps[file]) != self.stamps[file]
+        ]
+
+    def run(
+        self,
+        on_result: Callable[[Path, list[RuleViolation]], None],
+        interval: float = 0.5,
+    ) -> None:
+        """检查所有文件，之后每隔 interval 秒检查一次变化，直到被中断"""
+        while True:
+            for file in self.changed():
+                try:
+                    violations = self.check(file)
+                except CX.TranslationUnitLoadError:
+                    # 编辑器保存时可能先删除文件再重命名，文件再次出现后重新检查
+                    self.stamps[file] = _stamps([str(file)])
+                    continue
+                on_result(file, violations)
+            time.sleep(interval)
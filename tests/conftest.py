@@ -0,0 +1,28 @@
+import pytest
+
+# 宏展开后约有 6700 万个记号，解析需要很长时间与大量内存
+BOMB_CONTENT = (
+    "#define X0 0+\n"
+    + "".join(f"#define X{i} X{i - 1} X{i - 1}\n" for i in range(1, 27))
+    + "int a = X26 0;\n"
+)
+
+
+@pytest.fixture()
+def write_files(tmp_path):
+    """按 {文件名: 内容} 在 tmp_path 中写入文件，按顺序返回路径"""
+
+    def write(sources):
+        files = []
+        for name, content in sources.items():
+            (file := tmp_path / name).write_text(content)
+            files.append(file)
+        return files
+
+    return write
+
+
+@pytest.fixture()
+def bomb_file(tmp_path):
+    (file := tmp_path / "bomb.cpp").write_text(BOMB_CONTENT)
+    return file
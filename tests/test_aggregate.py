@@ -0,0 +1,142 @@
+import io
+
+import pytest
+
+from tjhlp_checker import (
+    Checker,
+    CheckStats,
+    ViolationKind,
+    find_violated_kinds,
+    has_violations,
+)
+from tjhlp_checker.config import Config, GrammarConfig, ReportConfig
+from tjhlp_checker.report import TextReporter
+
+EXPANSIONS = 200
+
+
+@pytest.fixture()
+def cpp_file(tmp_path):
+    (cpp_file := tmp_path / "macro.cpp").write_text(
+        "#define STEP for (int i = 0; i < 1; i++) x = x << 1;\n"
+        "int x;\n"
+        "int main() {\n" + "    STEP\n" * EXPANSIONS + "    for (;;) {}\n"
+        "    x = x << 2;\n"
+        "}\n"
+    )
+    return cpp_file
+
+
+def check(cpp_file, stats=None, **report):
+    config = Config(
+        grammar=GrammarConfig(disable_loop=True, disable_bit_operation=True),
+        report=ReportConfig(**report),
+    )
+    return Checker(config, snippets=True).check(cpp_file, stats)
+
+
+def test_aggregate(cpp_file):
+    assert len(check(cpp_file)) == 2 * EXPANSIONS + 2
+
+    violations = check(cpp_file, aggregate=True)
+    # 宏的各次展开合并为一条，记在第一次展开处
+    assert [(vio.kind, vio.line, vio.count) for vio in violations] == [
+        (ViolationKind.LOOP, 4, EXPANSIONS),
+        (ViolationKind.BIT_OPERATION, 4, EXPANSIONS),
+        (ViolationKind.LOOP, EXPANSIONS + 4, 1),
+        (ViolationKind.BIT_OPERATION, EXPANSIONS + 5, 1),
+    ]
+
+    stream = io.StringIO()
+    TextReporter(stream).file_done(cpp_file, violations)
+    assert f"LOOP (4, 5) STEP ({EXPANSIONS} occurrences)" in stream.getvalue()
+
+
+def test_aggregate_only_macro_bodies(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(
+        "#define N 10\n"
+        "#define SHIFT(x) x;\n"
+        "#define POSITIVE(x) if (x > 0) return 3;\n"
+        "int f(int a, int b) {\n"
+        "    if (N > a) return 1;\n"
+        "    if (N < b) return 2;\n"
+        "    SHIFT(a << 1)\n"
+        "    SHIFT(b << 2)\n"
+        "    POSITIVE(a)\n"
+        "    POSITIVE(b)\n"
+        "    return N == a + b;\n"
+        "}\n"
+    )
+    config = Config(
+        grammar=GrammarConfig(disable_branch=True, disable_bit_operation=True),
+        report=ReportConfig(aggregate=True),
+    )
+    # 只是以宏开头、或写在宏参数中的节点不拼写在宏定义中，不合并；
+    # POSITIVE 定义中的 if 合并，而以参数开头的 x > 0 不合并
+    violations = Checker(config).check(cpp_file)
+    assert [(vio.kind, vio.line, vio.count) for vio in violations] == [
+        (ViolationKind.BRANCH, 5, 1),
+        (ViolationKind.BRANCH, 5, 1),
+        (ViolationKind.BRANCH, 6, 1),
+        (ViolationKind.BRANCH, 6, 1),
+        (ViolationKind.BIT_OPERATION, 7, 1),
+        (ViolationKind.BIT_OPERATION, 8, 1),
+        (ViolationKind.BRANCH, 9, 2),
+        (ViolationKind.BRANCH, 9, 1),
+        (ViolationKind.BRANCH, 10, 1),
+        (ViolationKind.BRANCH, 11, 1),
+    ]
+
+
+def test_aggregate_streaming(cpp_file):
+    config = Config(
+        grammar=GrammarConfig(disable_loop=True, disable_bit_operation=True),
+        report=ReportConfig(aggregate=True),
+    )
+    streamed = []
+    violations = Checker(config).check(cpp_file, on_violation=streamed.append)
+    # 流式输出的是合并完成后的结果
+    assert [vio.count for vio in streamed] == [EXPANSIONS, EXPANSIONS, 1, 1]
+    assert streamed == violations
+
+
+def test_max_per_kind(cpp_file):
+    full = CheckStats()
+    check(cpp_file, full)
+
+    stats = CheckStats()
+    violations = check(cpp_file, stats, max_per_kind=2)
+    assert [(vio.kind, vio.line) for vio in violations] == [
+        (ViolationKind.LOOP, 4),
+        (ViolationKind.BIT_OPERATION, 4),
+        (ViolationKind.LOOP, 5),
+        (ViolationKind.BIT_OPERATION, 5),
+    ]
+    # 两类违规都达到上限后不再遍历
+    assert stats.nodes_visited < full.nodes_visited / 10
+
+
+def test_early_exit(cpp_file, tmp_path):
+    config = Config(
+        grammar=GrammarConfig(
+            disable_loop=True, disable_bit_operation=True, disable_goto=True
+        )
+    )
+    assert has_violations(cpp_file, config)
+    # 没有 goto，不能提前结束，结果与完整检查一致
+    assert find_violated_kinds(cpp_file, config) == {
+        ViolationKind.LOOP,
+        ViolationKind.BIT_OPERATION,
+    }
+
+    (clean := tmp_path / "clean.cpp").write_text("int main() { return 0; }\n")
+    assert not has_violations(clean, config)
+    assert find_violated_kinds(clean, config) == set()
+
+    full = CheckStats()
+    check(cpp_file, full)
+    stats = CheckStats()
+    violations = check(cpp_file, stats, stop_at_first=True)
+    assert [(vio.kind, vio.line) for vio in violations] == [(ViolationKind.LOOP, 4)]
+    # 之前只访问了宏展开（翻译单元的直接子节点）与 main 开头的几个节点
+    assert stats.nodes_visited < EXPANSIONS + 10 < full.nodes_visited / 10
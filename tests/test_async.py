@@ -0,0 +1,71 @@
+import asyncio
+import time
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import AsyncChecker, Checker, check_async, load_config
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+
+@pytest.fixture()
+def cpp_files(write_files):
+    return write_files(
+        {
+            f"{i}.cpp": "int main() {\n" + "    while (0) {}\n" * i + "}\n"
+            for i in range(6)
+        }
+    )
+
+
+def test_async_checker(cpp_files):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    async def main():
+        async with AsyncChecker(config, concurrency=2) as checker:
+            return await checker.check_all(cpp_files)
+
+    results = asyncio.run(main())
+    assert results == [Checker(config).check(file) for file in cpp_files]
+    assert asyncio.run(check_async(cpp_files[3], config)) == results[3]
+
+
+def test_async_timeout_and_cancel(cpp_files):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    async def main():
+        async with AsyncChecker(config, concurrency=1) as checker:
+            with pytest.raises(TimeoutError):
+                await checker.check(cpp_files[1], timeout=0)
+
+            task = asyncio.create_task(checker.check(cpp_files[2]))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # 超时与取消不影响之后的检查
+            return await checker.check(cpp_files[4], timeout=60)
+
+    assert len(asyncio.run(main())) == 4
+
+
+def test_async_timeout_frees_worker(cpp_files, bomb_file):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    async def main():
+        async with AsyncChecker(config, concurrency=1) as checker:
+            with pytest.raises(TimeoutError):
+                await checker.check(bomb_file, timeout=0.5)
+            # 超时的检查不再占用唯一的工作进程
+            start = time.perf_counter()
+            violations = await checker.check(cpp_files[1], timeout=10)
+            return violations, time.perf_counter() - start
+
+    violations, elapsed = asyncio.run(main())
+    assert len(violations) == 1
+    assert elapsed < 5
@@ -0,0 +1,41 @@
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import Checker, ViolationKind, find_all_violations, load_config
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+SOURCES = {
+    "a.cpp": "int main() { for (;;) {} }\n",
+    "b.cpp": "int main() { return 0; }\n",
+    "c.cpp": "int main() { while (1) {} do {} while (0); }\n",
+}
+
+
+@pytest.fixture()
+def cpp_files(write_files):
+    return write_files(SOURCES)
+
+
+def test_check_all(cpp_files):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+    checker = Checker(config)
+
+    results = list(checker.check_all(cpp_files))
+
+    assert [file for file, _ in results] == cpp_files
+    assert [len(violations) for _, violations in results] == [1, 0, 2]
+    assert all(
+        vio.kind == ViolationKind.LOOP
+        for _, violations in results
+        for vio in violations
+    )
+    # 与逐个调用 find_all_violations 的结果一致
+    for file, violations in results:
+        assert list(map(str, violations)) == list(
+            map(str, find_all_violations(file, config))
+        )
@@ -0,0 +1,55 @@
+import json
+
+from tjhlp_checker import bench
+from tjhlp_checker.config import GrammarConfig
+
+
+def test_generate_corpus(tmp_path):
+    corpus = bench.generate_corpus(tmp_path)
+    assert set(corpus) == {"small", "stl", "deep", "large"}
+    assert all(file.exists() for files in corpus.values() for file in files)
+    # 生成的语料是确定的
+    assert bench.generate_corpus(tmp_path / "again") == {
+        category: [tmp_path / "again" / file.relative_to(tmp_path) for file in files]
+        for category, files in corpus.items()
+    }
+    assert (tmp_path / "small" / "3.cpp").read_text() == bench.small_program(3)
+
+
+def test_run_benchmark(tmp_path):
+    (file := tmp_path / "deep.cpp").write_text(bench.deep_expression(100))
+    results = bench.run_benchmark({"deep": [file]}, repeat=1)
+
+    assert results["files"] == {"deep": 1}
+    assert results["nodes"]["deep"] > 100
+    assert set(results["traverse"]) == {
+        "walk",
+        "all",
+        "loop",
+        "system_class",
+        "header",
+    } | {
+        name.removeprefix("disable_")
+        for name in GrammarConfig.model_fields
+        if name != "system_class"
+    }
+
+    assert set(results["import"]) == set(bench.IMPORT_BUDGETS)
+    assert all(seconds > 0 for seconds in results["import"].values())
+
+    bench.save_results(results, tmp_path / "results.json")
+    saved = json.loads((tmp_path / "results.json").read_text())
+    assert bench.compare(saved, results) == []
+
+    slower = json.loads(json.dumps(results))
+    slower["parse"]["deep"] = results["parse"]["deep"] * 2 + 1
+    assert bench.compare(results, slower) == [
+        f"parse/deep: {results['parse']['deep']:.3f}s -> {slower['parse']['deep']:.3f}s"
+    ]
+
+
+def test_import_budget():
+    assert bench.over_budget({"tjhlp_checker": 0.001}) == []
+    assert bench.over_budget({"tjhlp_checker": 1.0}) == [
+        "import tjhlp_checker: 1000.0ms > 30ms"
+    ]
@@ -0,0 +1,61 @@
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import Checker, ResultCache, load_config
+
+CPP_CONTENT = """\
+#include "my_header.h"
+
+int main() {
+    while (LIMIT) {}
+}
+"""
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+
+@pytest.fixture()
+def cpp_file(tmp_path):
+    (tmp_path / "my_header.h").write_text("#define LIMIT 0\n")
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    return cpp_file
+
+
+def test_cache_hit(cpp_file, tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "cache")
+    config = load_config(BytesIO(CONFIG_CONTENT))
+    violations = Checker(config, cache=cache).check(cpp_file)
+    assert len(violations) == 1
+
+    # 命中缓存时不再解析
+    def fail(*_):
+        raise AssertionError("unexpected parse")
+
+    monkeypatch.setattr(Checker, "parse", fail)
+    assert (
+        Checker(config, cache=ResultCache(tmp_path / "cache")).check(cpp_file)
+        == violations
+    )
+
+
+def test_cache_invalidation(cpp_file, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    config = load_config(BytesIO(CONFIG_CONTENT))
+    assert len(Checker(config, cache=cache).check(cpp_file)) == 1
+
+    # 修改被包含的头文件
+    (tmp_path / "my_header.h").write_text("#define LIMIT 0\nvoid f() { for (;;) {} }\n")
+    assert len(Checker(config, cache=cache).check(cpp_file)) == 2
+
+    # 修改配置
+    config = load_config(BytesIO(b"[grammar]\ndisable_function = true\n"))
+    assert len(Checker(config, cache=cache).check(cpp_file)) == 1
+
+    # 修改源文件
+    cpp_file.write_text(CPP_CONTENT + "void g() { for (;;) {} }\n")
+    config = load_config(BytesIO(CONFIG_CONTENT))
+    assert len(Checker(config, cache=cache).check(cpp_file)) == 3
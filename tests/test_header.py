@@ -1,5 +1,11 @@
 import pytest
-from tjhlp_checker import find_all_violations, load_config, ViolationKind
+from tjhlp_checker import (
+    Checker,
+    CheckStats,
+    find_all_violations,
+    load_config,
+    ViolationKind,
+)
 from pydantic import ValidationError
 from io import BytesIO
 
@@ -68,9 +74,9 @@ def test_blacklist(cpp_file, tmp_path):
 
     assert all(vio.kind == ViolationKind.HEADER for vio in violations)
     # <algorithm>
-    assert violations[0].cursor.location.line == 3
+    assert violations[0].line == 3
     # my_header.h 中间接包含了禁用的 vector
-    assert violations[1].cursor.location.line == 4
+    assert violations[1].line == 4
     # 尽管 queue 也在禁用之列, 但根据相对位置能发现它是自定义头文件，不计入违规
     # 头文件第二次包含时由于 define guard, 违规不会重复报
 
@@ -80,3 +86,46 @@ def test_whitelist(cpp_file):
         cpp_file, load_config(BytesIO(WHITELIST_CONFIG_CONTENT))
     )
     assert len(violations) == 6
+
+
+def test_header_decisions_cached(cpp_file, tmp_path):
+    config = load_config(
+        BytesIO(
+            BLACKLIST_CONFIG_CONTENT + f'base_path = "{tmp_path.as_posix()}"'.encode()
+        )
+    )
+    assert config.header.blacklist_set == frozenset(["vector", "algorithm", "queue"])
+    # 私有的集合不参与序列化，缓存键不变
+    assert "blacklist_set" not in config.model_dump_json()
+
+    checker = Checker(config)
+    first = checker.check(cpp_file)
+
+    # 第二次检查时每个头文件的判定都来自缓存，不再访问文件系统
+    misses = checker.rules.is_banned_header.cache_info().misses
+    assert checker.check(cpp_file) == first
+    assert checker.rules.is_banned_header.cache_info().misses == misses
+
+
+def test_header_only_fast_path(cpp_file, tmp_path):
+    config = load_config(
+        BytesIO(
+            BLACKLIST_CONFIG_CONTENT + f'base_path = "{tmp_path.as_posix()}"'.encode()
+        )
+    )
+    checker = Checker(config)
+    assert checker.rules.header_only
+
+    # 没有包含禁用的头文件时完全不遍历
+    (tmp_path / "local.h").write_text("#define LOCAL 1\n")
+    (clean := tmp_path / "clean.cpp").write_text(
+        '#include <cstdlib>\n#include "local.h"\n'
+    )
+    stats = CheckStats()
+    assert checker.check(clean, stats) == []
+    assert stats.nodes_visited == 0
+
+    # 否则只遍历翻译单元的直接子节点
+    violations = checker.check(cpp_file, stats)
+    assert [vio.line for vio in violations] == [3, 4]
+    assert stats.nodes_visited < 100
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+def test_lazy_import():
+    assert (
+        run(
+            "import sys, tjhlp_checker\n"
+            "tjhlp_checker.ViolationKind.POINTER\n"
+            "print('clang.cindex' in sys.modules, 'pydantic' in sys.modules)"
+        )
+        == "False False"
+    )
+    assert (
+        run(
+            "import sys, tjhlp_checker\n"
+            "tjhlp_checker.load_config\n"
+            "print('clang.cindex' in sys.modules)"
+        )
+        == "False"
+    )
+    assert (
+        run(
+            "import sys, tjhlp_checker\n"
+            "tjhlp_checker.Checker\n"
+            "print('clang.cindex' in sys.modules)"
+        )
+        == "True"
+    )
+    assert run("import tjhlp_checker; print(tjhlp_checker.Checker.__module__)") == (
+        "tjhlp_checker.checker"
+    )
+
+
+def test_libclang_loaded_first(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(
+        "int main() {\n    int a = 1 << 2;\n    return -a;\n}\n"
+    )
+    # libclang 在导入检查器之前已经加载，补充的函数原型仍然要生效
+    assert (
+        run(
+            "import clang.cindex, tjhlp_checker\n"
+            "from tjhlp_checker.config import Config, GrammarConfig\n"
+            "clang.cindex.Index.create()\n"
+            "config = Config(grammar=GrammarConfig(disable_bit_operation=True))\n"
+            f"print(len(tjhlp_checker.find_all_violations({str(cpp_file)!r}, config)))"
+        )
+        == "1"
+    )
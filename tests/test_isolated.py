@@ -0,0 +1,79 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import IsolatedChecker, ViolationKind, check_isolated, load_config
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+
+@pytest.fixture()
+def cpp_files(write_files, bomb_file):
+    [ok] = write_files({"ok.cpp": "int main() {\n    while (0) {}\n}\n"})
+    return ok, bomb_file
+
+
+def test_timeout(cpp_files):
+    ok, bomb = cpp_files
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    results = list(check_isolated([ok, bomb, ok], config, jobs=2, timeout=0.5))
+    assert [file for file, _ in results] == [ok, bomb, ok]
+    assert [[v.kind for v in violations] for _, violations in results] == [
+        [ViolationKind.LOOP],
+        [ViolationKind.TIMEOUT],
+        [ViolationKind.LOOP],
+    ]
+    assert results[1][1][0].file == str(bomb)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="RLIMIT_AS is POSIX only")
+def test_memory_limit(cpp_files):
+    ok, bomb = cpp_files
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    with IsolatedChecker(config, memory_limit=300 * 1024 * 1024) as checker:
+        [violation] = checker.check(bomb)
+        assert violation.kind == ViolationKind.CHECK_FAILED
+        # 失败之后的文件不受影响
+        assert [v.kind for v in checker.check(ok)] == [ViolationKind.LOOP]
+
+    # 内存上限不足以加载 libclang 时，工作进程在启动过程中退出
+    with IsolatedChecker(config, memory_limit=64 * 1024 * 1024) as checker:
+        [violation] = checker.check(ok)
+        assert violation.kind == ViolationKind.CHECK_FAILED
+        assert "during startup" in violation.extra_message
+
+
+def test_worker_died(cpp_files):
+    ok, _ = cpp_files
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    with IsolatedChecker(config) as checker:
+        assert [v.kind for v in checker.check(ok)] == [ViolationKind.LOOP]
+        # 在两次检查之间退出的工作进程会被重新启动
+        checker._process.kill()
+        checker._process.join()
+        assert [v.kind for v in checker.check(ok)] == [ViolationKind.LOOP]
+
+
+def test_kill(cpp_files):
+    ok, bomb = cpp_files
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    with IsolatedChecker(config) as checker, ThreadPoolExecutor(1) as executor:
+        future = executor.submit(checker.check, bomb)
+        # 等待工作进程启动并开始检查
+        while checker._conn is None:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        checker.kill()
+        [violation] = future.result(timeout=10)
+        assert violation.kind == ViolationKind.CHECK_FAILED
+        assert [v.kind for v in checker.check(ok)] == [ViolationKind.LOOP]
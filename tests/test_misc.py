@@ -34,3 +34,36 @@ whitelist = ["iostream"]
         ),
     )
     assert len(violations) == 1
+
+
+def test_violation_record(tmp_path):
+    cpp_file = tmp_path / "record.cpp"
+    cpp_file.write_text("int loop() {\n    while (1) {}\n}\n")
+    config = load_config(BytesIO(b"[grammar]\ndisable_loop = true\n"))
+
+    (violation,) = find_all_violations(cpp_file, config)
+    assert (violation.file, violation.line, violation.column) == (
+        str(cpp_file),
+        2,
+        5,
+    )
+    assert violation.context == "loop"
+    assert (
+        cpp_file.read_bytes()[violation.start_offset : violation.end_offset]
+        == b"while (1) {}"
+    )
+    assert violation.cursor is None and violation.context_cursor is None
+
+    (violation,) = find_all_violations(cpp_file, config, keep_cursors=True)
+    assert violation.cursor and violation.cursor.location.line == 2
+    assert violation.context_cursor and violation.context_cursor.spelling == "loop"
+
+
+def test_deeply_nested_expression(tmp_path):
+    cpp_file = tmp_path / "nested.cpp"
+    cpp_file.write_text("int main() { return " + " + ".join(["1"] * 5000) + " & 1; }\n")
+
+    violations = find_all_violations(
+        cpp_file, load_config(BytesIO(b"[grammar]\ndisable_bit_operation = true\n"))
+    )
+    assert len(violations) == 1
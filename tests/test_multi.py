@@ -0,0 +1,53 @@
+from io import BytesIO
+
+import clang.cindex as CX
+
+from tjhlp_checker import CheckStats, MultiChecker, find_all_violations, load_config
+
+CPP_CONTENT = """\
+#include <vector>
+
+struct Point {
+    int x, y;
+};
+
+int total;
+
+int main() {
+    for (int i = 0; i < 3; i++)
+        total += i;
+    return total > 1 ? 0 : 1;
+}
+"""
+
+CONFIGS = [
+    b"[grammar]\ndisable_loop = true\n",
+    b"[grammar]\ndisable_struct = true\ndisable_external_global_var = true\n",
+    b"[header]\nblacklist = ['vector']\n",
+    b"[grammar]\ndisable_branch = true\n",
+    b"",
+    b"[common]\nis_32bit = true\n[grammar]\ndisable_loop = true\n",
+]
+
+
+def test_multi_config(tmp_path, monkeypatch):
+    (file := tmp_path / "multi.cpp").write_text(CPP_CONTENT)
+    configs = [load_config(BytesIO(content)) for content in CONFIGS]
+
+    parses = []
+    parse = CX.Index.parse
+    monkeypatch.setattr(
+        CX.Index,
+        "parse",
+        lambda *args, **kwargs: parses.append(1) or parse(*args, **kwargs),
+    )
+    stats = CheckStats()
+    results = MultiChecker(configs).check(file, stats)
+    # [common] 相同的配置只解析、遍历一次
+    assert len(parses) == 2
+    assert stats.rule_calls["record_loop"] == 2
+    monkeypatch.undo()
+
+    # 与逐个配置检查的结果一致
+    assert results == [find_all_violations(file, config) for config in configs]
+    assert [len(violations) for violations in results] == [1, 2, 1, 3, 0, 1]
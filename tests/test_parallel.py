@@ -0,0 +1,55 @@
+import pickle
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import Checker, check_parallel, load_config
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_branch = true
+disable_loop = true
+"""
+
+
+@pytest.fixture()
+def cpp_files(write_files):
+    # 第 i 个文件中有 i 个循环和 1 个分支
+    return write_files(
+        {
+            f"{i}.cpp": "int main() {\n"
+            + "    while (0) {}\n" * i
+            + "    return 1 < 2;\n"
+            + "}\n"
+            for i in range(8)
+        }
+    )
+
+
+def test_check_parallel(cpp_files):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    results = list(check_parallel(cpp_files, config, jobs=3))
+
+    # 结果按输入顺序合并，且与串行检查一致
+    assert [file for file, _ in results] == cpp_files
+    assert [len(violations) for _, violations in results] == list(range(1, 9))
+    for (_, parallel), (_, serial) in zip(
+        results, Checker(config).check_all(cpp_files)
+    ):
+        assert list(map(str, parallel)) == list(map(str, serial))
+
+
+def test_pickle_violation(cpp_files):
+    config = load_config(BytesIO(CONFIG_CONTENT))
+    violation = Checker(config).check(cpp_files[1])[0]
+
+    restored = pickle.loads(pickle.dumps(violation))
+
+    assert restored.kind == violation.kind
+    assert str(restored) == str(violation)
+    assert (restored.start_offset, restored.end_offset) == (
+        violation.start_offset,
+        violation.end_offset,
+    )
+    assert restored.cursor is None
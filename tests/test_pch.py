@@ -0,0 +1,83 @@
+import pytest
+
+from tjhlp_checker import Checker, PrecompiledHeaders
+from tjhlp_checker.config import Config, GrammarConfig, HeaderConfig
+from tjhlp_checker.pch import leading_includes
+
+CPP_CONTENT = """\
+/*
+ * 2459999 张三 信01
+ */
+#include <iostream> // 输入输出
+#include <cmath>
+#include "local.h"
+#include <climits>
+
+int main() {
+    for (int i = 0; i < 3; i++) {}
+    return 0;
+}
+"""
+
+
+def test_leading_includes():
+    assert leading_includes(CPP_CONTENT.encode()) == ["iostream", "cmath"]
+    assert leading_includes(b"using namespace std;\n#include <cmath>\n") == []
+
+
+@pytest.fixture()
+def cpp_file(tmp_path):
+    (tmp_path / "local.h").write_text("#include <string>\n")
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    return cpp_file
+
+
+def test_pch(cpp_file, tmp_path):
+    config = Config(
+        header=HeaderConfig(whitelist=["iostream"], base_path=tmp_path),
+        grammar=GrammarConfig(disable_loop=True, disable_branch=True),
+    )
+    pch = PrecompiledHeaders(tmp_path / "pch", ["iostream", "cmath", "climits"])
+
+    expected = Checker(config).check(cpp_file)
+    # <cmath>、local.h 中的 <string>、<climits>，以及循环和分支
+    assert len(expected) == 5
+    assert Checker(config, pch=pch).check(cpp_file) == expected
+    # 只为 <iostream><cmath> 这一前缀构建了一个 PCH
+    assert len(list((tmp_path / "pch").glob("*.pch"))) == 1
+    # 复用已构建的 PCH
+    assert Checker(config, pch=pch).check(cpp_file) == expected
+
+
+def test_pch_header_only(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(
+        "#include <vector>\n#include <map>\n"
+    )
+    config = Config(header=HeaderConfig(blacklist=["map"]))
+    pch = PrecompiledHeaders(tmp_path / "pch", ["vector", "map"])
+
+    # 由 PCH 提供的包含不出现在 clang_getInclusions 中，只检查头文件时也要遍历
+    expected = Checker(config).check(cpp_file)
+    assert [(vio.line, vio.column) for vio in expected] == [(2, 1)]
+    assert Checker(config, pch=pch).check(cpp_file) == expected
+
+
+def test_pch_with_errors(tmp_path):
+    config = Config(grammar=GrammarConfig(disable_loop=True))
+    pch = PrecompiledHeaders(tmp_path / "pch", ["vector", "no_such_header"])
+
+    # 构建出错的 PCH 不保存，之后也不再尝试构建
+    (broken := tmp_path / "broken.cpp").write_text(
+        "#include <vector>\n#include <no_such_header>\nint main() { for (;;) {} }\n"
+    )
+    assert Checker(config, pch=pch).check(broken) == Checker(config).check(broken)
+    assert list((tmp_path / "pch").glob("*.pch")) == []
+    assert len(list((tmp_path / "pch").glob("*.failed"))) == 1
+
+    # 使用 PCH 时出现错误，以不使用 PCH 的解析结果为准
+    (cpp_file := tmp_path / "main.cpp").write_text(
+        "#include <vector>\nint main() { undefined(); for (;;) {} }\n"
+    )
+    expected = Checker(config).check(cpp_file)
+    assert len(expected) == 1
+    assert Checker(config, pch=pch).check(cpp_file) == expected
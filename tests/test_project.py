@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from tjhlp_checker import ViolationKind
+from tjhlp_checker.config import Config, GrammarConfig
+from tjhlp_checker.project import Project, check_project
+
+SHARED_HEADER = """\
+#pragma once
+struct Point {
+    int x, y;
+};
+"""
+
+SOURCES = {
+    "a.cpp": '#include "shared.h"\nint main() { Point p{}; return p.x; }\n',
+    "b.cpp": '#include "shared.h"\nint f() { for (;;) {} }\n',
+    "shared.h": SHARED_HEADER,
+    # 没有被任何源文件包含
+    "unused.h": "struct Unused {};\n",
+}
+
+
+@pytest.fixture()
+def project_dir(tmp_path):
+    for name, content in SOURCES.items():
+        (tmp_path / name).write_text(content)
+    return tmp_path
+
+
+@pytest.fixture()
+def config():
+    return Config(grammar=GrammarConfig(disable_struct=True, disable_loop=True))
+
+
+def test_project_directory(project_dir, config):
+    results = check_project(project_dir, config)
+
+    assert list(results) == [
+        project_dir / "a.cpp",
+        project_dir / "shared.h",
+        project_dir / "b.cpp",
+        project_dir / "unused.h",
+    ]
+    # shared.h 被两个源文件包含，其中的违规只报告一次
+    assert [vio.kind for vio in results[project_dir / "shared.h"]] == [
+        ViolationKind.STRUCT
+    ]
+    assert results[project_dir / "a.cpp"] == []
+    assert [vio.kind for vio in results[project_dir / "b.cpp"]] == [ViolationKind.LOOP]
+    assert [vio.kind for vio in results[project_dir / "unused.h"]] == [
+        ViolationKind.STRUCT
+    ]
+
+
+def test_project_compile_commands(project_dir, config):
+    (include := project_dir / "include").mkdir()
+    (project_dir / "shared.h").rename(include / "shared.h")
+    (project_dir / "c.cpp").write_text(
+        '#include "shared.h"\n#ifdef USE_LOOP\nvoid g() { while (1) {} }\n#endif\n'
+    )
+    commands = [
+        {
+            "directory": str(project_dir),
+            "command": f"c++ -Iinclude -DUSE_LOOP -O2 -c {name} -o {name}.o",
+            "file": name,
+        }
+        for name in ("a.cpp", "c.cpp")
+    ]
+    (compile_commands := project_dir / "compile_commands.json").write_text(
+        json.dumps(commands)
+    )
+
+    project = Project.load(compile_commands)
+    assert project.units[0][1] == ["-I", str(project_dir / "include"), "-D", "USE_LOOP"]
+
+    results = check_project(project, config)
+    assert list(results) == [
+        project_dir / "a.cpp",
+        include / "shared.h",
+        project_dir / "c.cpp",
+    ]
+    assert [vio.kind for vio in results[project_dir / "c.cpp"]] == [ViolationKind.LOOP]
@@ -0,0 +1,75 @@
+import io
+import json
+from io import BytesIO
+
+from tjhlp_checker import Checker, load_config
+from tjhlp_checker.report import JsonLinesReporter, SarifReporter, TextReporter
+
+CPP_CONTENT = """\
+#include "my_header.h"
+
+int main() {
+    while (LIMIT) {}
+    for (;;) {}
+}
+"""
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+
+def check(tmp_path, reporter):
+    (tmp_path / "my_header.h").write_text(
+        "#define LIMIT 0\nvoid f() { do {} while (0); }\n"
+    )
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    checker = Checker(load_config(BytesIO(CONFIG_CONTENT)), snippets=True)
+
+    reporter.start()
+    streamed = []
+
+    def on_violation(violation):
+        streamed.append(violation)
+        reporter.violation(cpp_file, violation)
+
+    violations = checker.check(cpp_file, on_violation=on_violation)
+    reporter.file_done(cpp_file, violations)
+    reporter.finish()
+    assert streamed == violations
+    return cpp_file, violations
+
+
+def test_snippet(tmp_path):
+    _, violations = check(tmp_path, TextReporter(io.StringIO()))
+    # 源码片段取自各自所在的文件
+    assert [violation.snippet for violation in violations] == [
+        "do {} while (0)",
+        "while (LIMIT) {}",
+        "for (;;) {}",
+    ]
+    # 默认不填写源码片段
+    checker = Checker(load_config(BytesIO(CONFIG_CONTENT)))
+    assert all(
+        violation.snippet is None for violation in checker.check(tmp_path / "main.cpp")
+    )
+
+
+def test_jsonl(tmp_path):
+    stream = io.StringIO()
+    cpp_file, violations = check(tmp_path, JsonLinesReporter(stream))
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line.pop("checked_file") for line in lines] == [str(cpp_file)] * 3
+    assert lines == [violation.to_dict() for violation in violations]
+
+
+def test_sarif(tmp_path):
+    stream = io.StringIO()
+    cpp_file, _ = check(tmp_path, SarifReporter(stream))
+    [run] = json.loads(stream.getvalue())["runs"]
+    assert [result["ruleId"] for result in run["results"]] == ["LOOP"] * 3
+    location = run["results"][1]["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == cpp_file.resolve().as_uri()
+    assert location["region"]["startLine"] == 4
+    assert location["region"]["snippet"]["text"] == "while (LIMIT) {}"
@@ -0,0 +1,87 @@
+import threading
+from io import BytesIO
+
+import pytest
+
+from tjhlp_checker import Checker, load_config
+from tjhlp_checker.client import request
+from tjhlp_checker.server import CheckService, create_server
+
+CPP_CONTENT = """\
+int main() {
+    int a[3];
+    while (a[0]) {}
+}
+"""
+
+CONFIG_CONTENT = """\
+[grammar]
+disable_loop = true
+"""
+
+
+@pytest.fixture()
+def address(tmp_path):
+    config = load_config(BytesIO(CONFIG_CONTENT.encode()))
+    server = create_server(str(tmp_path / "checker.sock"), CheckService(config))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield str(tmp_path / "checker.sock")
+    server.shutdown()
+    server.server_close()
+
+
+def test_server(address, tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+
+    # 使用服务的默认配置
+    [result] = request(address, [str(cpp_file)])
+    checker = Checker(load_config(BytesIO(CONFIG_CONTENT.encode())), snippets=True)
+    expected = checker.check(cpp_file)
+    assert result["file"] == str(cpp_file)
+    assert result["violations"] == [violation.to_dict() for violation in expected]
+    [result] = request(address, [str(cpp_file)], snippets=False)
+    assert [violation["snippet"] for violation in result["violations"]] == [None] * len(
+        expected
+    )
+
+    # 请求中指定配置
+    config = "[grammar]\ndisable_array = true\ndisable_loop = true\n"
+    [result] = request(address, [str(cpp_file)], config)
+    assert [violation["kind"] for violation in result["violations"]] == [
+        "ARRAY",
+        "LOOP",
+        "ARRAY",
+    ]
+
+    with pytest.raises(RuntimeError):
+        request(address, [str(cpp_file)], '[common]\nencoding = "nope"\n')
+    with pytest.raises(RuntimeError):
+        request(address, [str(tmp_path / "missing.cpp")])
+
+
+def test_service_checkers_bounded():
+    service = CheckService(max_checkers=2)
+    configs = [
+        f"[grammar]\n{name} = true\n"
+        for name in ("disable_loop", "disable_array", "disable_goto")
+    ]
+    first = service.checker(configs[0])
+    service.checker(configs[1])
+    # 最近使用过的保留，最久未使用的被丢弃
+    assert service.checker(configs[0]) is first
+    service.checker(configs[2])
+    assert len(service.configs) == len(service.checkers) == 2
+    assert service.checker(configs[0]) is first
+    assert configs[1] not in service.configs
+
+
+def test_listen_path_not_socket(tmp_path):
+    (path := tmp_path / "notes.txt").write_text("keep me")
+    with pytest.raises(OSError):
+        create_server(str(path), CheckService())
+    assert path.read_text() == "keep me"
+
+    # 残留的 socket 文件会被替换
+    create_server(str(sock := tmp_path / "checker.sock"), CheckService()).server_close()
+    create_server(str(sock), CheckService()).server_close()
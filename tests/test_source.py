@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from tjhlp_checker import (
+    Checker,
+    PrecompiledHeaders,
+    ViolationKind,
+)
+from tjhlp_checker.config import Config, GrammarConfig, HeaderConfig
+
+CPP_CONTENT = """\
+#include <iostream>
+#include <vector>
+#include "shape.h"
+using namespace std;
+
+int main() {
+    Shape s{1, 2};
+    for (int i = 0; i < 3; i++)
+        cout << "面积" << s.w * s.h << endl;
+    return 0;
+}
+"""
+
+HEADER_CONTENT = "struct Shape {\n    int w, h;\n};\n"
+
+
+@pytest.fixture()
+def config(tmp_path):
+    return Config(
+        common={"encoding": "gbk"},
+        header=HeaderConfig(blacklist=["vector", "shape.h"], base_path=tmp_path),
+        grammar=GrammarConfig(disable_loop=True, disable_struct=True),
+    )
+
+
+@pytest.mark.parametrize("use_pch", [False, True])
+def test_check_source(config, tmp_path, use_pch):
+    pch = PrecompiledHeaders(tmp_path / "pch", ["iostream"]) if use_pch else None
+    checker = Checker(config, pch=pch, snippets=True)
+    violations = checker.check_source(
+        CPP_CONTENT, "main.cpp", {"shape.h": HEADER_CONTENT}
+    )
+    # 不在磁盘上留下任何文件
+    assert sorted(os.listdir(tmp_path)) == (["pch"] if use_pch else [])
+
+    assert [(vio.kind, vio.file, vio.line) for vio in violations] == [
+        (ViolationKind.HEADER, str(tmp_path / "main.cpp"), 2),
+        (ViolationKind.STRUCT, str(tmp_path / "shape.h"), 1),
+        (ViolationKind.LOOP, str(tmp_path / "main.cpp"), 8),
+    ]
+    assert violations[-1].snippet.startswith("for (int i = 0; i < 3; i++)")
+
+    # 与写入磁盘后检查的结果一致
+    (tmp_path / "main.cpp").write_bytes(CPP_CONTENT.encode("gbk"))
+    (tmp_path / "shape.h").write_text(HEADER_CONTENT)
+    assert violations == Checker(config, snippets=True).check(tmp_path / "main.cpp")
+
+
+@pytest.mark.parametrize("use_pch", [False, True])
+def test_check_empty_source(config, tmp_path, use_pch):
+    pch = PrecompiledHeaders(tmp_path / "pch", ["iostream"]) if use_pch else None
+    assert Checker(config, pch=pch).check_source(b"") == []
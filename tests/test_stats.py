@@ -0,0 +1,69 @@
+from io import BytesIO
+
+from tjhlp_checker import Checker, CheckStats, ResultCache, load_config
+
+CPP_CONTENT = """\
+#include <cstddef>
+
+int main() {
+    int a = 1;
+    while (a) {
+        if (a & 1) a--;
+    }
+}
+"""
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+disable_bit_operation = true
+"""
+
+
+def test_stats(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    checker = Checker(load_config(BytesIO(CONFIG_CONTENT)))
+
+    stats = CheckStats()
+    assert len(checker.check(cpp_file, stats)) == 2
+    assert stats.files == 1
+    assert stats.parse_time > 0 and stats.walk_time > 0
+    assert stats.nodes_visited > 10
+    assert stats.nodes_skipped_system > 0
+    assert stats.rule_calls == {
+        "record_loop": 1,
+        "check_binary_operator": 1,
+        "check_unary_operator": 1,
+    }
+    assert set(stats.rule_time) == set(stats.rule_calls)
+    assert stats.libclang_calls == {}
+
+    # 跨文件累加
+    checker.check(cpp_file, stats)
+    assert stats.files == 2
+    assert stats.rule_calls["record_loop"] == 2
+    assert "rules:" in stats.summary()
+
+    # 单独解析时也计入解析耗时
+    stats = CheckStats()
+    checker.parse(cpp_file, stats=stats)
+    assert stats.parse_time > 0 and stats.files == 0
+
+
+def test_stats_libclang_calls_and_cache(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    checker = Checker(
+        load_config(BytesIO(CONFIG_CONTENT)), cache=ResultCache(tmp_path / "cache")
+    )
+
+    stats = CheckStats(count_libclang_calls=True)
+    checker.check(cpp_file, stats)
+    checker.check(cpp_file, stats)
+    assert (stats.result_cache_hits, stats.result_cache_misses) == (1, 1)
+    assert stats.libclang_calls["clang_visitChildren"] == 1
+    assert stats.libclang_calls["clang_getCursorBinaryOperatorKind"] == 1
+
+    # 统计结束后恢复原来的函数
+    calls = dict(stats.libclang_calls)
+    checker.check(cpp_file)
+    assert stats.libclang_calls == calls
@@ -1,8 +1,15 @@
 from io import BytesIO
 
+import clang.cindex as CX
 import pytest
 
-from tjhlp_checker import find_all_violations, load_config, ViolationKind
+from tjhlp_checker import (
+    Checker,
+    CheckStats,
+    find_all_violations,
+    load_config,
+    ViolationKind,
+)
 from tjhlp_checker.config import Config, GrammarConfig
 
 CPP_CONTENT = """\
@@ -172,3 +179,100 @@ def test_global_and_static_local(cpp_file):
         sum(1 for vio in violations if vio.kind == ViolationKind.INTERNAL_GLOBAL) == 2
     )
     assert sum(1 for vio in violations if vio.kind == ViolationKind.STATIC_LOCAL) == 1
+
+
+def test_disabled_rules_cost_nothing(cpp_file, monkeypatch):
+    # 没有启用任何与类型相关的规则时，不应查询任何节点的类型
+    monkeypatch.setattr(
+        CX.Cursor, "type", property(lambda _: pytest.fail("unexpected type query"))
+    )
+    violations = find_all_violations(
+        cpp_file, Config(grammar=GrammarConfig(disable_loop=True))
+    )
+    assert len(violations) == 3
+    assert all(vio.kind == ViolationKind.LOOP for vio in violations)
+
+
+SKIPPED_BODIES_CONTENT = """\
+#define INNER NESTED
+#define NESTED struct Nested {};
+#define ONE 1
+
+struct Outer {
+    int m() { return ONE; }
+};
+
+int f() {
+    INNER
+    return ONE;
+}
+
+int g() {
+    extern int ext;
+    return ext;
+}
+
+int main() { return f() + g(); }
+"""
+
+# 整个函数（包括函数体）都来自宏展开
+MACRO_BODIES_CONTENT = """\
+#define DEFINE_F(n) void n() { struct S { int a; }; extern int q; }
+DEFINE_F(f)
+DEFINE_F(g)
+"""
+
+
+# 命令行中定义的宏没有源码，## 拼接出的关键字在定义中也看不到
+COMMAND_LINE_MACRO_CONTENT = "void f() { BODY }\n"
+PASTED_KEYWORD_CONTENT = """\
+#define CAT(a, b) a##b
+void f() { CAT(str, uct) S{}; }
+"""
+
+
+@pytest.mark.parametrize(
+    ("content", "args", "rules", "fallbacks"),
+    [
+        # f 中展开了含有 struct 的宏，g 中有 extern 声明
+        (SKIPPED_BODIES_CONTENT, [], {"disable_struct": True}, 1),
+        (SKIPPED_BODIES_CONTENT, [], {"disable_external_global_var": True}, 1),
+        # 函数体中没有 class 关键字，不需要完整解析
+        (SKIPPED_BODIES_CONTENT, [], {"disable_class": True}, 0),
+        (MACRO_BODIES_CONTENT, [], {"disable_struct": True}, 1),
+        (MACRO_BODIES_CONTENT, [], {"disable_external_global_var": True}, 1),
+        (MACRO_BODIES_CONTENT, [], {"disable_class": True}, 0),
+        (
+            COMMAND_LINE_MACRO_CONTENT,
+            ["-DBODY=struct S{int a;};"],
+            {"disable_struct": True},
+            1,
+        ),
+        (PASTED_KEYWORD_CONTENT, [], {"disable_struct": True}, 1),
+    ],
+    ids=[
+        "struct",
+        "extern",
+        "class",
+        "macro-struct",
+        "macro-extern",
+        "macro-class",
+        "command-line-macro",
+        "pasted-keyword",
+    ],
+)
+def test_skip_function_bodies(tmp_path, content, args, rules, fallbacks):
+    (file := tmp_path / "bodies.cpp").write_text(content)
+    checker = Checker(Config(grammar=GrammarConfig(**rules)))
+    assert checker.rules.skip_function_bodies
+
+    stats = CheckStats()
+    violations = checker.check_translation_unit(
+        checker.parse(file, extra_args=args), stats
+    )
+    assert stats.function_body_fallbacks == fallbacks
+    full = checker.rules.check(
+        checker.parse(file, skip_function_bodies=False, extra_args=args)
+    )
+    assert violations == full
+    assert violations or not fallbacks
@@ -2,7 +2,7 @@ from io import BytesIO
 
 import pytest
 
-from tjhlp_checker import ViolationKind, find_all_violations, load_config
+from tjhlp_checker import CheckStats, ViolationKind, find_all_violations, load_config
 
 CPP_CONTENT = """\
 #include <stdint.h>
@@ -140,3 +140,24 @@ disable_external_global_var = true
         ),
     )
     assert len(violations) == 9
+
+
+def test_type_cache(cpp_file):
+    stats = CheckStats()
+    violations = find_all_violations(
+        cpp_file,
+        load_config(
+            BytesIO(
+                b"""\
+[grammar]
+disable_pointer = true
+"""
+            )
+        ),
+        stats=stats,
+    )
+    # 缓存不影响结果
+    assert len(violations) == 8
+    # 例如 void*、long long 等类型在文件中重复出现
+    assert stats.type_cache_hits > 0
+    assert 0 < stats.type_cache_hit_rate < 1
@@ -0,0 +1,84 @@
+import os
+from io import BytesIO
+
+import pytest
+from clang.cindex import TranslationUnitLoadError
+
+from tjhlp_checker import Checker, CheckStats, load_config
+from tjhlp_checker.watch import Watcher
+
+CPP_CONTENT = """\
+#include "my_header.h"
+
+int main() {
+    while (LIMIT) {}
+}
+"""
+
+CONFIG_CONTENT = b"""\
+[grammar]
+disable_loop = true
+"""
+
+
+def touch(path, content):
+    # 保证修改时间一定变化，不受文件系统时间精度影响
+    stat = os.stat(path)
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watch_reparse(tmp_path):
+    (header := tmp_path / "my_header.h").write_text("#define LIMIT 0\n")
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    watcher = Watcher(Checker(config), [cpp_file])
+    assert watcher.changed() == [cpp_file]
+    assert len(watcher.check(cpp_file)) == 1
+    assert watcher.changed() == []
+
+    # 修改源文件
+    touch(cpp_file, CPP_CONTENT + "void g() { for (;;) {} }\n")
+    assert watcher.changed() == [cpp_file]
+    assert len(watcher.check(cpp_file)) == 2
+
+    # 修改被包含的头文件
+    touch(header, "#define LIMIT 0\nvoid f() { for (;;) {} }\n")
+    assert watcher.changed() == [cpp_file]
+    violations = watcher.check(cpp_file)
+    assert len(violations) == 3
+    assert violations == Checker(config).check(cpp_file)
+
+
+def test_watch_deleted_file(tmp_path):
+    (tmp_path / "my_header.h").write_text("#define LIMIT 0\n")
+    (cpp_file := tmp_path / "main.cpp").write_text(CPP_CONTENT)
+    config = load_config(BytesIO(CONFIG_CONTENT))
+
+    watcher = Watcher(Checker(config), [cpp_file])
+    assert len(watcher.check(cpp_file)) == 1
+
+    # 编辑器先删除再重命名地保存：文件暂时不存在时不能重新解析
+    cpp_file.unlink()
+    assert watcher.changed() == [cpp_file]
+    with pytest.raises(TranslationUnitLoadError):
+        watcher.check(cpp_file)
+    assert cpp_file not in watcher.units
+
+    cpp_file.write_text(CPP_CONTENT + "void g() { for (;;) {} }\n")
+    assert len(watcher.check(cpp_file)) == 2
+
+
+def test_watch_keeps_function_bodies(tmp_path):
+    (cpp_file := tmp_path / "main.cpp").write_text("void f() { struct S {}; }\n")
+    config = load_config(BytesIO(b"[grammar]\ndisable_struct = true\n"))
+
+    # 只有声明层面的规则时，保留的翻译单元也要包含函数体，不必再完整解析
+    watcher = Watcher(checker := Checker(config), [cpp_file])
+    assert len(watcher.check(cpp_file)) == 1
+    checker.check_translation_unit(watcher.units[cpp_file], stats := CheckStats())
+    assert stats.function_body_fallbacks == 0
+
+    touch(cpp_file, "void f() { struct S {}; struct T {}; }\n")
+    assert len(watcher.check(cpp_file)) == 2